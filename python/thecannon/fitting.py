@@ -8,16 +8,26 @@ Fitting functions for use in The Cannon.
 from __future__ import (division, print_function, absolute_import,
                         unicode_literals)
 
-__all__ = ["fit_spectrum", "fit_pixel_fixed_scatter", "fit_theta_by_linalg",
-    "chi_sq", "L1Norm_variation"]
+__all__ = ["fit_spectrum", "fit_spectra_by_gauss_newton",
+    "fit_pixel_fixed_scatter", "fit_pixels_by_coordinate_descent",
+    "fit_theta_by_linalg",
+    "fit_theta_by_linalg_batch", "chi_sq", "L1Norm_variation"]
 
 import logging
 import numpy as np
 import scipy.optimize as op
+from scipy.linalg import blas, lapack
 from time import time
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit, prange, vectorize
+
+except ImportError:
+    logger.debug("Could not import numba; using numpy objective functions")
+    njit, prange, vectorize = (None, range, None)
+
 
 def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
     scales, dispersion=None, use_derivatives=True, op_kwds=None):
@@ -58,7 +68,7 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
         matrix, and metadata associated with the optimization.
     """
 
-    adjusted_ivar = ivar/(1. + ivar * s2)
+    adjusted_ivar = _adjusted_ivar(ivar, s2)
 
     # Exclude non-finite points (e.g., points with zero inverse variance
     # or non-finite flux values, but the latter shouldn't exist anyway).
@@ -75,6 +85,10 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
     weights = np.sqrt(adjusted_ivar[use]) # --> 1.0 / sigma
     use_theta = theta[use]
 
+    # Fold the weights into the model once, rather than at every evaluation.
+    weighted_flux = weights * flux
+    weighted_theta_T = (weights * use_theta.T).copy()
+
     initial_labels = np.atleast_2d(initial_labels)
 
     # Check the vectorizer whether it has a derivative built in.
@@ -84,8 +98,8 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
 
         except NotImplementedError:
             Dfun = None
-            logger.warn("No label vector derivatives available in {}!".format(
-                vectorizer))
+            logger.warn("No label vector derivatives available in %s!",
+                vectorizer)
 
         except:
             logger.exception("Exception raised when trying to calculate the "\
@@ -94,8 +108,9 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
 
         else:
             # Use the label vector derivative.
-            Dfun = lambda parameters: weights * np.dot(use_theta,
-                vectorizer.get_label_vector_derivative(parameters)).T
+            Dfun = lambda parameters: np.dot(
+                vectorizer.get_label_vector_derivative(parameters).T,
+                weighted_theta_T)
 
     else:
         Dfun = None
@@ -104,7 +119,8 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
         return np.dot(use_theta, vectorizer(parameters))[:, 0]
 
     def residuals(parameters):
-        return weights * (func(parameters) - flux)
+        return np.dot(vectorizer(parameters)[:, 0], weighted_theta_T) \
+             - weighted_flux
 
     kwds = {
         "func": residuals,
@@ -173,7 +189,7 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
         "best_result_index": best_result_index,
         "derivatives_used": Dfun is not None,
         "snr": np.nanmedian(flux * weights),
-        "r_chi_sq": meta["chi_sq"]/(use.sum() - L - 1),
+        "r_chi_sq": meta["chi_sq"]/(np.count_nonzero(use) - L - 1),
     })
     for key in ("ftol", "xtol", "gtol", "maxfev", "factor", "epsfcn"):
         meta[key] = kwds[key]
@@ -182,7 +198,119 @@ def fit_spectrum(flux, ivar, initial_labels, vectorizer, theta, s2, fiducials,
 
 
 
-def fit_theta_by_linalg(flux, ivar, s2, design_matrix):
+def fit_pixels_by_coordinate_descent(flux, ivar, initial_theta, design_matrix,
+    regularization, censored_theta=None, xtol=1e-10, maxiter=10000):
+    """
+    Fit theta coefficients for many pixels at once by cyclic coordinate descent,
+    minimizing the same objective function as `fit_pixel_fixed_scatter`. All
+    pixels share the design matrix, so each coefficient is updated across every
+    pixel with one matrix-vector product.
+
+    :param flux:
+        The normalized fluxes, as shape `(num_stars, num_pixels)`.
+
+    :param ivar:
+        The inverse variance of the normalized flux values, with the same shape
+        as `flux`.
+
+    :param initial_theta:
+        The theta coefficients to start from, as shape
+        `(num_pixels, num_terms)`.
+
+    :param design_matrix:
+        The model design matrix, as shape `(num_stars, num_terms)`.
+
+    :param regularization:
+        The regularization strength (Lambda), either a single value or an array
+        of size `num_pixels`. The first coefficient is not regularized.
+
+    :param censored_theta: [optional]
+        A boolean array of shape `(num_pixels, num_terms)` indicating theta
+        coefficients that are censored (fixed at zero) in each pixel.
+
+    :param xtol: [optional]
+        A pixel has converged when no coefficient changed by more than this in
+        a full sweep.
+
+    :param maxiter: [optional]
+        The maximum number of full sweeps over the coefficients.
+
+    :returns:
+        The optimized theta coefficients, as shape `(num_pixels, num_terms)`,
+        and the number of sweeps made for each pixel.
+    """
+
+    flux, ivar = (np.atleast_2d(flux), np.atleast_2d(ivar))
+    S, P = flux.shape
+    T = design_matrix.shape[1]
+
+    theta = np.array(initial_theta, dtype=float)
+    threshold = 0.5 * regularization * np.ones(P)
+    if censored_theta is None:
+        censored_theta = np.zeros((P, T), dtype=bool)
+    theta[censored_theta] = 0.0
+
+    # chi^2 is quadratic in theta, so each update only needs the weighted Gram
+    # matrix (ATCiA) of each pixel and the gradient, which is kept up to date.
+    # Do this in blocks of pixels to limit the memory required.
+    B = _block_size(T)
+    cached_outer = _design_matrix_outer_products(design_matrix) \
+        if S <= B else None
+
+    n_iter = np.zeros(P, dtype=int)
+    for i in range(0, P, B):
+        pixels = slice(i, i + B)
+        ATCiA = _weighted_gram_matrices(ivar[:, pixels], design_matrix, B,
+            cached_outer)
+        half_gradient = np.dot(design_matrix.T, ivar[:, pixels] \
+            * (flux[:, pixels] - np.dot(design_matrix, theta[pixels].T))).T
+
+        if _coordinate_descent_pixels is not None:
+            # Sweep each pixel in parallel with the compiled kernel.
+            theta[pixels], n_iter[pixels] = _coordinate_descent_pixels(
+                theta[pixels], ATCiA, np.ascontiguousarray(half_gradient),
+                threshold[pixels], ~censored_theta[pixels], float(xtol),
+                int(maxiter))
+            continue
+
+        block_theta = theta[pixels]
+        block_n_iter = n_iter[pixels]
+        block_threshold = threshold[pixels]
+        updatable = ~censored_theta[pixels] \
+                  & (np.diagonal(ATCiA, axis1=1, axis2=2) > 0)
+
+        active = np.ones(block_theta.shape[0], dtype=bool)
+        while np.any(active):
+            block_n_iter[active] += 1
+            max_change = np.zeros(active.sum())
+
+            for t in range(T):
+                curvature = ATCiA[active, t, t]
+                rho = half_gradient[active, t] \
+                    + curvature * block_theta[active, t]
+                if t > 0:
+                    rho = np.sign(rho) * np.clip(
+                        np.abs(rho) - block_threshold[active], 0, None)
+
+                new_theta = np.where(updatable[active, t],
+                    rho / np.where(updatable[active, t], curvature, 1.0),
+                    block_theta[active, t])
+
+                change = new_theta - block_theta[active, t]
+                half_gradient[active] -= ATCiA[active, :, t] * change[:, None]
+                block_theta[active, t] = new_theta
+                max_change = np.maximum(max_change, np.abs(change))
+
+            converged = (max_change <= xtol) | (block_n_iter[active] >= maxiter)
+            active[np.where(active)[0][converged]] = False
+
+        theta[pixels] = block_theta
+        n_iter[pixels] = block_n_iter
+
+    return (theta, n_iter)
+
+
+def fit_theta_by_linalg(flux, ivar, s2, design_matrix, full_output=True):
     """
     Fit theta coefficients to a set of normalized fluxes for a single pixel.
 
@@ -199,25 +327,351 @@ def fit_theta_by_linalg(flux, ivar, s2, design_matrix):
     :param design_matrix:
         The model design matrix.
 
+    :param full_output: [optional]
+        Also calculate the inverse variance matrix. If `False`, then `None` is
+        returned in place of the inverse variance matrix.
+
     :returns:
         The label vector coefficients for the pixel, and the inverse variance
         matrix.
     """
 
-    adjusted_ivar = ivar/(1. + ivar * s2)
-    CiA = design_matrix * np.tile(adjusted_ivar, (design_matrix.shape[1], 1)).T
-    try:
-        ATCiAinv = np.linalg.inv(np.dot(design_matrix.T, CiA))
-    except np.linalg.linalg.LinAlgError:
-        N = design_matrix.shape[1]
-        return (np.hstack([1, np.zeros(N - 1)]), np.inf * np.eye(N))
+    N = design_matrix.shape[1]
+    fiducial = lambda: (np.hstack([1, np.zeros(N - 1)]),
+        np.inf * np.eye(N) if full_output else None)
 
+    # Masked pixels carry no information, so don't bother factorizing.
+    if not np.any(ivar):
+        return fiducial()
+
+    adjusted_ivar = _adjusted_ivar(ivar, s2)
     ATY = np.dot(design_matrix.T, flux * adjusted_ivar)
-    theta = np.dot(ATCiAinv, ATY)
 
+    # ATCiA is a weighted Gram matrix, so only form one triangle of it with a
+    # symmetric rank-k update, and solve it by Cholesky factorization.
+    ATCiA = blas.dsyrk(1.0, design_matrix.T * np.sqrt(adjusted_ivar))
+    factor, theta, info = lapack.dposv(ATCiA, ATY)
+
+    if info != 0:
+        # The matrix is not positive definite, which happens when there are
+        # too few informative stars in this pixel to constrain every term.
+        # Try again with a small amount of Tikhonov regularization.
+        ATCiA = np.triu(ATCiA) + np.triu(ATCiA, 1).T
+        ATCiA += 1e-10 * np.trace(ATCiA) / N * np.eye(N) # MAGIC
+        try:
+            theta = np.linalg.solve(ATCiA, ATY)
+        except np.linalg.LinAlgError:
+            return fiducial()
+
+        return (theta, np.linalg.inv(ATCiA) if full_output else None)
+
+    if not full_output:
+        return (theta, None)
+
+    ATCiAinv, info = lapack.dpotri(factor)
+    ATCiAinv = np.triu(ATCiAinv) + np.triu(ATCiAinv, 1).T
     return (theta, ATCiAinv)
 
 
+def fit_theta_by_linalg_batch(flux, ivar, s2, design_matrix, full_output=False):
+    """
+    Fit theta coefficients to the normalized fluxes of many pixels at once, by
+    solving the normal equations of all pixels in batches.
+
+    :param flux:
+        The normalized fluxes, as shape `(num_stars, num_pixels)`.
+
+    :param ivar:
+        The inverse variance of the normalized flux values, with the same shape
+        as `flux`.
+
+    :param s2:
+        The noise residual (squared scatter term) to adopt in each pixel. This
+        can be a single value, or an array of size `num_pixels`.
+
+    :param design_matrix:
+        The model design matrix, as shape `(num_stars, num_terms)`.
+
+    :param full_output: [optional]
+        Also return the inverse variance matrices of all pixels, which are
+        calculated together as one stack.
+
+    :returns:
+        The label vector coefficients for each pixel, as an array of shape
+        `(num_pixels, num_terms)`. If `full_output` is `True`, then the inverse
+        variance matrices are also returned, as an array of shape
+        `(num_pixels, num_terms, num_terms)`.
+    """
+
+    flux, ivar = (np.atleast_2d(flux), np.atleast_2d(ivar))
+    S, P = flux.shape
+    T = design_matrix.shape[1]
+
+    s2 = s2 * np.ones(P)
+    adjusted_ivar = _adjusted_ivar(ivar, s2)
+    ATY = np.dot((flux * adjusted_ivar).T, design_matrix)
+
+    theta = np.zeros((P, T))
+    theta[:, 0] = 1.0
+    if full_output:
+        ATCiAinv = np.tile(np.inf * np.eye(T), (P, 1, 1))
+
+    # Pixels without any information are singular; leave them at the fiducial.
+    informative = np.where(np.any(adjusted_ivar > 0, axis=0))[0]
+
+    # Do this in blocks of pixels to limit the memory required. If all stars fit
+    # in one block then the outer products are only needed once.
+    B = _block_size(T)
+    cached_outer = _design_matrix_outer_products(design_matrix) \
+        if S <= B else None
+
+    for i in range(0, informative.size, B):
+        pixels = informative[i:i + B]
+
+        ATCiA = _weighted_gram_matrices(adjusted_ivar[:, pixels], design_matrix,
+            B, cached_outer)
+
+        try:
+            if full_output:
+                ATCiAinv[pixels] = np.linalg.inv(ATCiA)
+                theta[pixels] = np.matmul(
+                    ATCiAinv[pixels], ATY[pixels, :, None])[:, :, 0]
+
+            else:
+                theta[pixels] = np.linalg.solve(
+                    ATCiA, ATY[pixels, :, None])[:, :, 0]
+
+        except np.linalg.linalg.LinAlgError:
+            # At least one singular pixel in this batch: solve them one by one.
+            for pixel in pixels:
+                theta[pixel], pixel_ATCiAinv = fit_theta_by_linalg(
+                    flux[:, pixel], ivar[:, pixel], s2[pixel], design_matrix,
+                    full_output=full_output)
+                if full_output:
+                    ATCiAinv[pixel] = pixel_ATCiAinv
+
+    return (theta, ATCiAinv) if full_output else theta
+
+
+
+def fit_spectra_by_gauss_newton(flux, ivar, initial_labels, vectorizer, theta,
+    s2, fiducials, scales, max_iter=100, tol=1e-10):
+    """
+    Fit many spectra at once by damped Gauss-Newton (Levenberg-Marquardt)
+    iterations, where each iteration is a handful of array operations across
+    all spectra.
+
+    Since every spectrum shares the same model, the normal equations of each
+    spectrum only depend on the weighted Gram matrix of the model coefficients
+    in that spectrum, which is calculated once before iterating.
+
+    :param flux:
+        The normalized flux values, as shape `(num_spectra, num_pixels)`.
+
+    :param ivar:
+        The inverse variance array for the normalized fluxes.
+
+    :param initial_labels:
+        The point to initialize optimization from, for each spectrum.
+
+    :param vectorizer:
+        The vectorizer to use when fitting the data. It must provide analytic
+        label vector derivatives for many sets of labels at once.
+
+    :param theta:
+        The theta coefficients (spectral derivatives) of the trained model.
+
+    :param s2:
+        The pixel scatter (s^2) array for each pixel.
+
+    :param fiducials:
+        The fiducial offsets for each label.
+
+    :param scales:
+        The scales for each label.
+
+    :param max_iter: [optional]
+        The maximum number of iterations.
+
+    :param tol: [optional]
+        The relative change in (scaled) labels that indicates convergence.
+
+    :returns:
+        A three-length tuple containing: the optimized labels, the covariance
+        matrices, and a list of metadata associated with each spectrum.
+    """
+
+    flux, ivar = (np.atleast_2d(flux), np.atleast_2d(ivar))
+    N, P = flux.shape
+    T = theta.shape[1]
+
+    # Exclude non-finite points, as in fit_spectrum.
+    adjusted_ivar = _adjusted_ivar(ivar, s2)
+    use = np.isfinite(flux * adjusted_ivar) * (adjusted_ivar > 0) \
+        * np.all(np.isfinite(theta), axis=1)
+    weights = np.where(use, adjusted_ivar, 0.0)
+    flux = np.where(use, flux, 0.0)
+    theta = np.where(np.isfinite(theta), theta, 0.0)
+
+    # chi^2 = c - 2 b.v + v.G.v for the label vector v of each spectrum.
+    G = np.zeros((N, T, T))
+    upper = np.triu_indices(T)
+    B = _block_size(T)
+    for j in range(0, P, B):
+        G[:, upper[0], upper[1]] += np.dot(weights[:, j:j + B],
+            theta[j:j + B, upper[0]] * theta[j:j + B, upper[1]])
+    G[:, upper[1], upper[0]] = G[:, upper[0], upper[1]]
+    b = np.dot(weights * flux, theta)
+    c = np.sum(weights * flux**2, axis=1)
+
+    def chi_sq(v):
+        return c - 2 * np.sum(b * v, axis=1) \
+                 + np.sum(v * np.matmul(G, v[:, :, None])[:, :, 0], axis=1)
+
+    def normal_equations(x):
+        v = vectorizer(x).T
+        dv = vectorizer.get_label_vector_derivative(x)
+        Gdv = np.matmul(G, dv)
+        A = np.matmul(dv.transpose(0, 2, 1), Gdv)
+        g = np.sum(dv * (b - np.matmul(G, v[:, :, None])[:, :, 0])[:, :, None],
+            axis=1)
+        return (chi_sq(v), A, g)
+
+    informative = np.any(use, axis=1)
+    x = (np.atleast_2d(initial_labels) - fiducials)/scales
+    x0 = x * scales + fiducials
+    L = x.shape[1]
+
+    # Per-spectrum damping, as in Levenberg-Marquardt.
+    damping = 1e-3 * np.ones(N) # MAGIC
+    n_iter = np.zeros(N, dtype=int)
+    active = informative.copy()
+    chi_sq_x, A, g = normal_equations(x)
+
+    for iteration in range(max_iter):
+        if not np.any(active):
+            break
+
+        n_iter[active] += 1
+        A_damped = A[active] + damping[active, None, None] \
+                 * (np.eye(L) * A[active])
+        try:
+            step = np.linalg.solve(A_damped, g[active, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            step = np.array([np.linalg.lstsq(a, y, rcond=None)[0] \
+                for a, y in zip(A_damped, g[active])])
+
+        trial = x.copy()
+        trial[active] += step
+        chi_sq_trial, A_trial, g_trial = normal_equations(trial)
+
+        # Only accept steps that improve the fit.
+        improved = np.zeros(N, dtype=bool)
+        improved[active] = chi_sq_trial[active] <= chi_sq_x[active]
+
+        x[improved] = trial[improved]
+        chi_sq_x[improved] = chi_sq_trial[improved]
+        A[improved], g[improved] = (A_trial[improved], g_trial[improved])
+        damping[improved] /= 10.0 # MAGIC
+        damping[active & ~improved] *= 10.0 # MAGIC
+
+        # A spectrum has converged once an accepted step is small, or when no
+        # step is accepted even with heavy damping.
+        small = np.all(np.abs(step) <= tol * (np.abs(x[active]) + tol), axis=1)
+        converged = np.zeros(N, dtype=bool)
+        converged[active] = (small & improved[active]) \
+                          | (damping[active] > 1e10) # MAGIC
+        active &= ~converged
+
+    labels = x * scales + fiducials
+    labels[~informative] = np.nan
+    try:
+        cov = np.linalg.inv(A)
+    except np.linalg.LinAlgError:
+        cov = np.array([np.linalg.pinv(a) for a in A])
+
+    model_flux = np.dot(vectorizer(x).T, theta.T)
+    chi_sq_final = np.sum(weights * (model_flux - flux)**2, axis=1)
+
+    # Degrees of freedom in each spectrum, counted for all spectra at once.
+    dof = np.count_nonzero(use, axis=1) - L - 1
+
+    meta = []
+    for n in range(N):
+        meta.append(dict(x0=x0[n], chi_sq=chi_sq_final[n],
+            r_chi_sq=chi_sq_final[n]/dof[n],
+            model_flux=model_flux[n], n_iter=n_iter[n],
+            converged=not active[n], method="gauss_newton",
+            label_names=vectorizer.label_names,
+            snr=np.nanmedian(flux[n][use[n]] * np.sqrt(weights[n][use[n]]))))
+        if not informative[n]:
+            meta[-1]["fail_message"] = "Pixels contained no information"
+
+    return (labels, cov, meta)
+
+
+def _block_size(T):
+    """
+    Return the number of rows (stars or pixels) of T x T outer products to
+    calculate at once, which limits each block to 2**24 values.
+
+    :param T:
+        The number of terms in the outer products.
+    """
+    return max(1, int(2**24 / T**2)) # MAGIC
+
+
+def _design_matrix_outer_products(design_matrix):
+    """
+    Return the upper triangle of the outer product of each row of the design
+    matrix with itself, as an array of shape `(num_stars, T * (T + 1) / 2)`.
+
+    :param design_matrix:
+        The model design matrix, as shape `(num_stars, T)`.
+    """
+    upper = np.triu_indices(design_matrix.shape[1])
+    return design_matrix[:, upper[0]] * design_matrix[:, upper[1]]
+
+
+def _weighted_gram_matrices(weights, design_matrix, block_size,
+    cached_outer=None):
+    """
+    Return the weighted Gram matrix `A^T W A` of the design matrix for each set
+    of weights. The design matrix is shared by all sets, so these are matrix
+    products with the per-star outer products of the design matrix. These are
+    symmetric, so only the upper triangle is calculated. This is done in blocks
+    of stars to limit the memory required.
+
+    :param weights:
+        The weights (e.g., inverse variances), as shape `(num_stars, M)`.
+
+    :param design_matrix:
+        The model design matrix, as shape `(num_stars, T)`.
+
+    :param block_size:
+        The number of stars to calculate outer products for at once.
+
+    :param cached_outer: [optional]
+        The outer products of all stars, from `_design_matrix_outer_products`.
+
+    :returns:
+        The weighted Gram matrices, as shape `(M, T, T)`.
+    """
+
+    S, T = design_matrix.shape
+    upper = np.triu_indices(T)
+
+    gram_upper = np.zeros((weights.shape[1], upper[0].size))
+    for j in range(0, S, block_size):
+        gram_upper += np.dot(weights[j:j + block_size].T,
+            _design_matrix_outer_products(design_matrix[j:j + block_size]) \
+                if cached_outer is None else cached_outer)
+
+    gram = np.empty((weights.shape[1], T, T))
+    gram[:, upper[0], upper[1]] = gram_upper
+    gram[:, upper[1], upper[0]] = gram_upper
+    return gram
+
 
 # TODO: This logic should probably go somewhere else.
 
@@ -271,7 +725,10 @@ def L1Norm_variation(theta):
         entry), and the derivative of the L1 norm of theta.
     """
 
-    return (np.sum(np.abs(theta[1:])), np.hstack([0.0, np.sign(theta[1:])]))
+    # dasum calculates the L1 norm in one pass without a temporary |theta|.
+    sign = np.sign(theta)
+    sign[0] = 0.0
+    return (blas.dasum(theta[1:]), sign)
 
 
 def _pixel_objective_function_fixed_scatter(theta, design_matrix, flux, ivar,
@@ -300,6 +757,11 @@ def _pixel_objective_function_fixed_scatter(theta, design_matrix, flux, ivar,
         Also return the analytic derivative of the objective function.
     """
 
+    if _objective_function_fixed_scatter is not None:
+        f, g = _objective_function_fixed_scatter(
+            theta, design_matrix, flux, ivar, regularization)
+        return (f, g) if gradient else f
+
     if gradient:
         csq, d_csq = chi_sq(theta, design_matrix, flux, ivar, gradient=True)
         L1, d_L1 = L1Norm_variation(theta)
@@ -316,12 +778,535 @@ def _pixel_objective_function_fixed_scatter(theta, design_matrix, flux, ivar,
         return csq + regularization * L1
 
 
-def _scatter_objective_function(scatter, residuals_squared, ivar):
-    adjusted_ivar = ivar/(1.0 + ivar * scatter**2)
-    chi_sq = residuals_squared * adjusted_ivar
+def _fused_objective_function_fixed_scatter(theta, design_matrix, flux, ivar,
+    regularization):
+    """
+    Calculate the objective function for a single regularized pixel with fixed
+    scatter, and its derivative, in a single pass over the stars. This is only
+    used when compiled by `numba` (releasing the GIL, so that pixels can be
+    trained in parallel threads); the arguments are the same as those of
+    `_pixel_objective_function_fixed_scatter`.
+    """
+
+    S, T = design_matrix.shape
+
+    f = 0.0
+    g = np.zeros(T)
+    for s in range(S):
+        model = 0.0
+        for t in range(T):
+            model += design_matrix[s, t] * theta[t]
+
+        ivar_residual = ivar[s] * (model - flux[s])
+        f += ivar_residual * (model - flux[s])
+        for t in range(T):
+            g[t] += 2.0 * ivar_residual * design_matrix[s, t]
+
+    for t in range(1, T):
+        f += regularization * abs(theta[t])
+        g[t] += regularization * np.sign(theta[t])
+
+    return (f, g)
+
+
+def _pixel_normal_equations(theta, design_matrix, flux, ivar, regularization):
+    """
+    Pre-compute the terms needed to evaluate the objective function for a
+    single regularized pixel with fixed scatter, without iterating over stars.
+
+    The chi-squared value is quadratic in theta, so it is expanded about the
+    given theta (where it is evaluated exactly) in terms of the weighted Gram
+    matrix of the design matrix. This avoids the loss of precision that comes
+    with expanding it about zero.
+
+    :param theta:
+        The spectral coefficients to expand the objective function about.
+
+    :param design_matrix:
+        The design matrix for the model.
+
+    :param flux:
+        The normalized flux values for a single pixel across many stars.
+
+    :param ivar:
+        The (adjusted) inverse variance of the normalized flux values.
+
+    :param regularization:
+        The regularization term to scale the L1 norm of theta with.
+
+    :returns:
+        A tuple of arguments for `_pixel_objective_function_normal_equations`.
+    """
+
+    theta = np.array(theta, dtype=float)
+    ivar_residuals = ivar * (np.dot(design_matrix, theta) - flux)
+    chi_sq_0 = np.dot(ivar_residuals, np.dot(design_matrix, theta) - flux)
+    half_gradient_0 = np.dot(design_matrix.T, ivar_residuals)
+    ATCiA = np.dot(design_matrix.T * ivar, design_matrix)
+    return (theta, chi_sq_0, half_gradient_0, ATCiA, float(regularization))
+
+
+def _pixel_objective_function_normal_equations(theta, theta_0, chi_sq_0,
+    half_gradient_0, ATCiA, regularization, gradient=True):
+    """
+    The objective function for a single regularized pixel with fixed scatter,
+    evaluated from the terms given by `_pixel_normal_equations`. This costs
+    O(T^2) for T spectral coefficients, regardless of the number of stars.
+
+    :param theta:
+        The spectral coefficients.
+
+    :param gradient: [optional]
+        Also return the analytic derivative of the objective function.
+    """
+
+    if _objective_function_normal_equations is not None:
+        f, g = _objective_function_normal_equations(theta, theta_0, chi_sq_0,
+            half_gradient_0, ATCiA, regularization)
+        return (f, g) if gradient else f
+
+    delta = theta - theta_0
+    half_gradient = half_gradient_0 + np.dot(ATCiA, delta)
+
+    L1, d_L1 = L1Norm_variation(theta)
+    f = chi_sq_0 + np.dot(delta, half_gradient_0 + half_gradient) \
+      + regularization * L1
+    if not gradient:
+        return f
+
+    return (f, 2.0 * half_gradient + regularization * d_L1)
+
+
+def _fused_objective_function_normal_equations(theta, theta_0, chi_sq_0,
+    half_gradient_0, ATCiA, regularization):
+    """
+    Calculate `_pixel_objective_function_normal_equations` and its derivative
+    in a single pass. This is only used when compiled by `numba`.
+    """
+
+    T = theta.size
+
+    f = chi_sq_0
+    g = np.zeros(T)
+    for i in range(T):
+        half_gradient = half_gradient_0[i]
+        for j in range(T):
+            half_gradient += ATCiA[i, j] * (theta[j] - theta_0[j])
+
+        f += (theta[i] - theta_0[i]) * (half_gradient_0[i] + half_gradient)
+        g[i] = 2.0 * half_gradient
+
+    for i in range(1, T):
+        f += regularization * abs(theta[i])
+        g[i] += regularization * np.sign(theta[i])
+
+    return (f, g)
+
+
+def _pixel_intercept_only_theta(theta_0, chi_sq_0, half_gradient_0, ATCiA,
+    regularization):
+    """
+    Return the solution for a single regularized pixel with fixed scatter if
+    the regularization is so strong that all coefficients except the first
+    (which is not regularized) are zero. This is the case when the gradient of
+    chi^2 with respect to every regularized coefficient, evaluated where only
+    the first coefficient is fit, is no larger than the regularization.
+
+    The arguments are those given by `_pixel_normal_equations`.
+
+    :returns:
+        The spectral coefficients, or `None` if the regularization is not
+        strong enough (or the first coefficient is unconstrained).
+    """
+
+    if not regularization > 0 or not ATCiA[0, 0] > 0:
+        return None
+
+    # A^T C^-1 y, recovered from the gradient at theta_0.
+    ATCiy = np.dot(ATCiA, theta_0) - half_gradient_0
+
+    theta = np.zeros_like(theta_0)
+    theta[0] = ATCiy[0] / ATCiA[0, 0]
+    half_gradient = ATCiA[:, 0] * theta[0] - ATCiy
+    if 2 * np.max(np.abs(half_gradient[1:]), initial=0) > regularization:
+        return None
+
+    return theta
+
+
+def _coordinate_descent_fixed_scatter(theta, design_matrix, flux, ivar,
+    regularization, xtol, maxiter):
+    """
+    Minimize the objective function for a single regularized pixel with fixed
+    scatter by cyclic coordinate descent. Each coefficient has a closed-form
+    (soft-thresholded) minimum when the others are held fixed, and the residual
+    vector is updated in place so that each update is linear in the number of
+    stars.
+
+    :param theta:
+        The initial spectral coefficients.
+
+    :param design_matrix:
+        The design matrix for the model.
+
+    :param flux:
+        The normalized flux values for a single pixel across many stars.
+
+    :param ivar:
+        The (adjusted) inverse variance of the normalized flux values.
+
+    :param regularization:
+        The regularization term to scale the L1 norm of theta with. The first
+        coefficient is not regularized.
+
+    :param xtol:
+        Stop when no coefficient changed by more than this in a full sweep.
+
+    :param maxiter:
+        The maximum number of full sweeps over the coefficients.
+
+    :returns:
+        The optimized spectral coefficients and the number of sweeps made.
+    """
+
+    # Each coefficient is updated from one column of the design matrix, so
+    # store the columns contiguously.
+    return _coordinate_descent_sweeps(np.array(theta, dtype=float),
+        np.ascontiguousarray(design_matrix.T, dtype=float),
+        np.ascontiguousarray(flux, dtype=float),
+        np.ascontiguousarray(ivar, dtype=float),
+        float(regularization), float(xtol), float(maxiter))
+
+
+def _coordinate_descent_normal_equations(theta, theta_0, chi_sq_0,
+    half_gradient_0, ATCiA, regularization, xtol, maxiter):
+    """
+    Minimize the objective function for a single regularized pixel with fixed
+    scatter by cyclic coordinate descent, as in
+    `_coordinate_descent_fixed_scatter`, but using the terms given by
+    `_pixel_normal_equations`. Each update then costs O(T) for T spectral
+    coefficients, regardless of the number of stars.
+    This is only used when `numba` is available.
+
+    :param theta:
+        The initial spectral coefficients.
+
+    :param xtol:
+        Stop when no coefficient changed by more than this in a full sweep.
+
+    :param maxiter:
+        The maximum number of full sweeps over the coefficients.
+
+    :returns:
+        The optimized spectral coefficients and the number of sweeps made.
+    """
+
+    theta = np.array(theta, dtype=float)
+    ATCiA = np.ascontiguousarray(ATCiA, dtype=float)
+    half_gradient = -(half_gradient_0 + np.dot(ATCiA, theta - theta_0))
+
+    theta, n_iter = _coordinate_descent_pixel(theta[None], ATCiA[None],
+        half_gradient[None], np.array([0.5 * regularization]),
+        np.ones((1, theta.size), dtype=bool),
+        float(xtol), int(maxiter))
+    return (theta[0], n_iter[0])
+
+
+def _coordinate_descent_sweeps(theta, design_matrix_T, flux, ivar,
+    regularization, xtol, maxiter):
+    """
+    Update the spectral coefficients in place by cyclic coordinate descent, as
+    described in `_coordinate_descent_fixed_scatter`. This is only used when
+    `numba` is not available; otherwise single pixels are fit with
+    `_coordinate_descent_normal_equations`.
+    """
+
+    T = theta.size
+
+    # chi^2 is quadratic in each coefficient, with curvature 2 * sum(ivar * D^2)
+    ivar_design_matrix_T = design_matrix_T * ivar
+    curvature = np.sum(ivar_design_matrix_T * design_matrix_T, axis=1)
+    threshold = 0.5 * regularization
+
+    residuals = flux - np.dot(theta, design_matrix_T)
+
+    # Once a full sweep has been made, only sweep the non-zero coefficients
+    # until they converge, then check all of them again with a full sweep.
+    n_iter, active_only = (0, False)
+    while n_iter < maxiter:
+        n_iter += 1
+
+        max_change = 0.0
+        for t in range(T):
+            if curvature[t] <= 0 or (active_only and theta[t] == 0):
+                continue
+
+            rho = np.dot(ivar_design_matrix_T[t], residuals) \
+                + curvature[t] * theta[t]
+            if t == 0:
+                new_theta = rho / curvature[t]
+            else:
+                new_theta = np.sign(rho) * max(abs(rho) - threshold, 0.0) \
+                          / curvature[t]
+
+            change = new_theta - theta[t]
+            if change != 0:
+                residuals -= change * design_matrix_T[t]
+                theta[t] = new_theta
+                max_change = max(max_change, abs(change))
+
+        if max_change > xtol:
+            active_only = True
+        elif active_only:
+            active_only = False
+        else:
+            break
+
+    return (theta, n_iter)
+
+
+def _parallel_coordinate_descent_pixels(theta, ATCiA, half_gradient,
+    threshold, uncensored_theta, xtol, maxiter):
+    """
+    Update the spectral coefficients of many pixels in place by cyclic
+    coordinate descent, as described in `fit_pixels_by_coordinate_descent`.
+    Each pixel is independent, so they are swept in parallel. This is only
+    used when compiled by `numba`.
+
+    :param theta:
+        The initial spectral coefficients, as shape `(num_pixels, num_terms)`.
+
+    :param ATCiA:
+        The weighted Gram matrix of the design matrix for each pixel, as shape
+        `(num_pixels, num_terms, num_terms)`.
+
+    :param half_gradient:
+        Half of the (negative) gradient of chi^2 at `theta` for each pixel,
+        with the same shape as `theta`. This is updated in place.
+
+    :param threshold:
+        Half the regularization strength for each pixel.
+
+    :param uncensored_theta:
+        A boolean array with the same shape as `theta`, indicating which
+        coefficients can be updated.
+    """
+
+    P, T = theta.shape
+
+    n_iter = np.zeros(P, dtype=np.int64)
+    for p in prange(P):
+        # Sweep the non-zero coefficients until they converge, as in
+        # `_coordinate_descent_sweeps`, then check all of them again.
+        active_only = False
+        while n_iter[p] < maxiter:
+            n_iter[p] += 1
+
+            max_change = 0.0
+            for t in range(T):
+                if not uncensored_theta[p, t] or ATCiA[p, t, t] <= 0 \
+                or (active_only and theta[p, t] == 0):
+                    continue
+
+                rho = half_gradient[p, t] + ATCiA[p, t, t] * theta[p, t]
+                if t > 0:
+                    rho = np.sign(rho) * max(abs(rho) - threshold[p], 0.0)
+
+                change = rho / ATCiA[p, t, t] - theta[p, t]
+                if change != 0:
+                    for i in range(T):
+                        half_gradient[p, i] -= ATCiA[p, i, t] * change
+                    theta[p, t] += change
+                    max_change = max(max_change, abs(change))
+
+            if max_change > xtol:
+                active_only = True
+            elif active_only:
+                active_only = False
+            else:
+                break
+
+    return (theta, n_iter)
+
+
+if njit is not None:
+    _objective_function_fixed_scatter = njit(
+        cache=True, fastmath=True, nogil=True)(
+            _fused_objective_function_fixed_scatter)
+else:
+    _objective_function_fixed_scatter = None
+
+if njit is not None:
+    _objective_function_normal_equations = njit(
+        cache=True, fastmath=True, nogil=True)(
+            _fused_objective_function_normal_equations)
+else:
+    _objective_function_normal_equations = None
+
+_coordinate_descent_pixels = None if njit is None \
+    else njit(cache=True, nogil=True, parallel=True)(
+        _parallel_coordinate_descent_pixels)
+
+# Single pixels are fit in parallel by the caller (e.g., in a process pool when
+# training), and may be fit from several threads at once, but some numba
+# threading layers cannot run parallel functions concurrently. A serial build
+# of the same kernel is used for them instead.
+_coordinate_descent_pixel = None if njit is None \
+    else njit(cache=True, nogil=True)(_parallel_coordinate_descent_pixels)
+
+
+def _fista_fixed_scatter(theta, theta_0, chi_sq_0, half_gradient_0, ATCiA,
+    regularization, xtol, maxiter):
+    """
+    Minimize the objective function for a single regularized pixel with fixed
+    scatter by accelerated proximal gradient descent (FISTA). Each step is a
+    gradient step on chi^2 followed by soft-thresholding for the L1 term, with
+    Nesterov momentum. The objective function is evaluated from the terms given
+    by `_pixel_normal_equations`, so each step costs O(T^2) for T spectral
+    coefficients, regardless of the number of stars.
+
+    :param theta:
+        The initial spectral coefficients.
+
+    :param xtol:
+        Stop when no coefficient changed by more than this in a step.
+
+    :param maxiter:
+        The maximum number of steps.
+
+    :returns:
+        The optimized spectral coefficients and the number of steps made.
+    """
+
+    # The gradient of chi^2 is Lipschitz continuous, with a constant given by
+    # the largest eigenvalue of its Hessian (2 * ATCiA).
+    lipschitz = 2 * np.linalg.eigvalsh(ATCiA)[-1]
+    if not lipschitz > 0:
+        return (np.array(theta, dtype=float), 0)
+
+    return _fista(np.array(theta, dtype=float),
+        np.ascontiguousarray(theta_0, dtype=float),
+        np.ascontiguousarray(half_gradient_0, dtype=float),
+        np.ascontiguousarray(ATCiA, dtype=float), lipschitz,
+        regularization / lipschitz, float(xtol), int(maxiter))
+
+
+def _fista_steps(theta, theta_0, half_gradient_0, ATCiA, lipschitz, threshold,
+    xtol, maxiter):
+    """
+    Update the spectral coefficients by accelerated proximal gradient descent,
+    as described in `_fista_fixed_scatter`. This is compiled by `numba` when it
+    is available.
+    """
+
+    momentum_theta, t = (theta.copy(), 1.0)
+
+    n_iter = 0
+    while n_iter < maxiter:
+        n_iter += 1
+
+        gradient = 2 * (half_gradient_0 \
+                 + np.dot(ATCiA, momentum_theta - theta_0))
+        new_theta = momentum_theta - gradient / lipschitz
+        new_theta[1:] = np.sign(new_theta[1:]) \
+                      * np.maximum(np.abs(new_theta[1:]) - threshold, 0.0)
+
+        change = new_theta - theta
+
+        # Restart the momentum if it is taking us uphill, which otherwise leads
+        # to slow oscillations when the problem is poorly conditioned.
+        if np.dot(momentum_theta - new_theta, change) > 0:
+            t = 1.0
+
+        new_t = 0.5 * (1 + np.sqrt(1 + 4 * t**2))
+        momentum_theta = new_theta + ((t - 1) / new_t) * change
+        theta, t = (new_theta, new_t)
+
+        if np.max(np.abs(change)) <= xtol:
+            break
+
+    return (theta, n_iter)
+
+
+_fista = _fista_steps if njit is None \
+    else njit(cache=True, nogil=True)(_fista_steps)
+
+
+def _adjusted_ivar(ivar, s2, out=None):
+    """
+    Return the inverse variance adjusted for the noise residual in each pixel,
+    `ivar/(1 + ivar * s2)`.
+
+    :param ivar:
+        The inverse variance of the normalized flux values.
+
+    :param s2:
+        The noise residual (squared scatter term).
+
+    :param out: [optional]
+        An array to store the result in, which avoids allocating temporary
+        arrays when this is called repeatedly.
+    """
+    if vectorize is not None:
+        return _get_adjusted_ivar_ufunc()(ivar, s2, out=out)
+
+    out = np.multiply(ivar, s2, out=out)
+    np.add(out, 1.0, out=out)
+    return np.divide(ivar, out, out=out)
+
+
+def _fused_adjusted_ivar(ivar, s2):
+    """
+    Calculate `_adjusted_ivar` for a single value. This is only used when
+    compiled by `numba` into a ufunc, which makes a single pass over the
+    inverse variance array instead of three.
+    """
+    return ivar / (1.0 + ivar * s2)
+
+
+_adjusted_ivar_ufunc = None
+
+def _get_adjusted_ivar_ufunc():
+    """
+    Return the `numba` ufunc for `_adjusted_ivar`. This is built on first use
+    rather than on import, because building it takes as long as importing the
+    rest of the package.
+    """
+    global _adjusted_ivar_ufunc
+    if _adjusted_ivar_ufunc is None:
+        _adjusted_ivar_ufunc = vectorize(["float64(float64, float64)"],
+            cache=True)(_fused_adjusted_ivar)
+    return _adjusted_ivar_ufunc
+
+
+def _scatter_objective_function(scatter, residuals_squared, ivar, out=None):
+    chi_sq = _adjusted_ivar(ivar, scatter**2, out=out)
+    np.multiply(residuals_squared, chi_sq, out=chi_sq)
     return (np.median(chi_sq) - 1.0)**2
 
 
+def _fit_scatter(residuals_squared, ivar):
+    """
+    Fit the noise residual in a single pixel, given the model residuals.
+
+    :param residuals_squared:
+        The squared residuals between the model and the normalized flux values.
+
+    :param ivar:
+        The inverse variance of the normalized flux values.
+
+    :returns:
+        The noise residual (squared scatter term) `s2`.
+    """
+
+    # This is a single parameter, so use Brent's method rather than a simplex.
+    # The objective function is symmetric about zero scatter.
+    scatter = op.minimize_scalar(_scatter_objective_function,
+        bracket=(0.0, 1.0), method="brent",
+        args=(residuals_squared, ivar, np.empty(ivar.shape))).x
+    return scatter**2
+
+
 def _remove_forbidden_op_kwds(op_method, op_kwds):
     """
     Remove forbidden optimization keywords.
@@ -339,12 +1324,14 @@ def _remove_forbidden_op_kwds(op_method, op_kwds):
         l_bfgs_b=("x0", "args", "bounds", "m", "factr", "pgtol", "epsilon", 
             "iprint", "maxfun", "maxiter", "disp", "callback", "maxls"),
         powell=("x0", "args", "xtol", "ftol", "maxiter", "maxfun", 
-            "full_output", "disp", "retall", "callback", "initial_simplex"))
+            "full_output", "disp", "retall", "callback", "initial_simplex"),
+        coordinate_descent=("x0", "args", "xtol", "maxiter"),
+        fista=("x0", "args", "xtol", "maxiter"))
 
     forbidden_keys = set(op_kwds).difference(all_allowed_keys[op_method])
     if forbidden_keys:
-        logger.warn("Ignoring forbidden optimization keywords for {}: {}"\
-            .format(op_method, ", ".join(forbidden_keys)))
+        logger.warn("Ignoring forbidden optimization keywords for %s: %s",
+            op_method, ", ".join(forbidden_keys))
         for key in forbidden_keys:
             del op_kwds[key]
 
@@ -378,7 +1365,8 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
         A per-label censoring mask for each pixel.
 
     :keyword op_method:
-        The optimization method to use. Valid options are: `l_bfgs_b`, `powell`.
+        The optimization method to use. Valid options are: `l_bfgs_b`, `powell`,
+        `coordinate_descent`, `fista`.
 
     :keyword op_kwds:
         A dictionary of arguments that will be provided to the optimizer.
@@ -395,8 +1383,11 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
 
     # Determine if any theta coefficients will be censored.
     censored_theta = ~np.any(np.isfinite(design_matrix), axis=0)
-    # Make the design matrix safe to use.
-    design_matrix[:, censored_theta] = 0
+    # Make the design matrix safe to use, without changing the (potentially
+    # shared) design matrix that was given.
+    if censored_theta.any():
+        design_matrix = np.copy(design_matrix)
+        design_matrix[:, censored_theta] = 0
 
     feval = []
     for initial_theta, initial_theta_source in initial_thetas:
@@ -422,7 +1413,7 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
 
         base_op_kwds["args"] = (new_design_matrix, new_flux, ivar, regularization)
 
-    if any(censored_theta):
+    if censored_theta.any():
         # If the initial_theta is the same size as the censored_mask, but different
         # to the design_matrix, then we need to censor the initial theta so that we
         # don't bother solving for those parameters.
@@ -430,6 +1421,16 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
         base_op_kwds["args"] = (design_matrix[:, ~censored_theta], flux, ivar,
             regularization)
 
+    # The gradient-based and simplex optimizers evaluate the objective function
+    # many times, so pre-compute the normal equations once for this pixel.
+    normal_equations = _pixel_normal_equations(
+        base_op_kwds["x0"], *base_op_kwds["args"])
+
+    # If the regularization is strong enough then only the first (unregularized)
+    # coefficient can be non-zero, and no optimization is needed.
+    intercept_theta = None if theta_0 is not None or censored_theta[0] \
+        else _pixel_intercept_only_theta(*normal_equations)
+
     # Allow either l_bfgs_b or powell
     t_init = time()
     default_op_method = "l_bfgs_b"
@@ -439,7 +1440,15 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
     op_strict = kwargs.get("op_strict", True)
 
     while True:
-        if op_method == "l_bfgs_b":
+        if intercept_theta is not None:
+            op_params = intercept_theta
+            fopt = _pixel_objective_function_normal_equations(
+                op_params, *normal_equations, gradient=False)
+            metadata = dict(fopt=fopt, n_iter=0, warnflag=0,
+                message="Regularization exceeds the largest useful value.")
+            break
+
+        elif op_method == "l_bfgs_b":
             op_kwds = dict()
             op_kwds.update(base_op_kwds)
             op_kwds.update(
@@ -448,15 +1457,16 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
 
             # If op_bounds are given and we are censoring some theta terms, then we
             # will need to adjust which op_bounds we provide.
-            if "bounds" in op_kwds and any(censored_theta):
+            if "bounds" in op_kwds and censored_theta.any():
                 op_kwds["bounds"] = [b for b, is_censored in \
                     zip(op_kwds["bounds"], censored_theta) if not is_censored]
 
             # Just-in-time to remove forbidden keywords.
             _remove_forbidden_op_kwds(op_method, op_kwds)
 
+            op_kwds["args"] = normal_equations
             op_params, fopt, metadata = op.fmin_l_bfgs_b(
-                _pixel_objective_function_fixed_scatter,
+                _pixel_objective_function_normal_equations,
                 fprime=None, approx_grad=None, **op_kwds)
 
             metadata.update(dict(fopt=fopt))
@@ -465,11 +1475,12 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
             if warnflag > 0:
                 reason = "too many function evaluations or too many iterations" \
                          if warnflag == 1 else metadata["task"]
-                logger.warn("Optimization warning (l_bfgs_b): {}".format(reason))
+                logger.warn("Optimization warning (l_bfgs_b): %s", reason)
 
                 if op_strict:
-                    # Do optimization again.
-                    op_method = "powell" 
+                    # Do optimization again. The objective function is not
+                    # smooth, but it is easily minimized one term at a time.
+                    op_method = "coordinate_descent"
                     base_op_kwds.update(x0=op_params)
                 else:
                     break
@@ -480,12 +1491,17 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
         elif op_method == "powell":
             op_kwds = dict()
             op_kwds.update(base_op_kwds)
-            op_kwds.update(xtol=1e-6, ftol=1e-6)
+            # Powell's method can wander for a long time when the objective is
+            # flat (e.g., where many coefficients are regularized to zero), so
+            # bound the work in proportion to the number of coefficients.
+            op_kwds.update(xtol=1e-6, ftol=1e-6,
+                maxiter=200 * len(op_kwds["x0"]),
+                maxfun=500 * len(op_kwds["x0"])) # MAGIC
             op_kwds.update((kwargs.get("op_kwds", {}) or {}))
 
             # Set 'False' in args so that we don't return the gradient, 
             # because fmin doesn't want it.
-            args = list(op_kwds["args"])
+            args = list(normal_equations)
             args.append(False)
             op_kwds["args"] = tuple(args)
 
@@ -495,23 +1511,82 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
             _remove_forbidden_op_kwds(op_method, op_kwds)
 
             op_params, fopt, direc, n_iter, n_funcs, warnflag = op.fmin_powell(
-                _pixel_objective_function_fixed_scatter, 
+                _pixel_objective_function_normal_equations, 
                 full_output=True, **op_kwds)
 
             metadata = dict(fopt=fopt, direc=direc, n_iter=n_iter, 
                 n_funcs=n_funcs, warnflag=warnflag)
+
+            if warnflag > 0:
+                reason = "too many function evaluations" if warnflag == 1 else \
+                    ("too many iterations" if warnflag == 2 else "NaN result")
+                logger.warn("Optimization warning (powell): %s", reason)
+
+                if op_strict:
+                    # Finish from where Powell's method stopped.
+                    op_method = "coordinate_descent"
+                    base_op_kwds.update(x0=op_params)
+                    continue
+
+            break
+
+        elif op_method == "coordinate_descent":
+            op_kwds = dict(x0=base_op_kwds["x0"], args=base_op_kwds["args"])
+            op_kwds.update(xtol=1e-10, maxiter=10000) # MAGIC
+            op_kwds.update((kwargs.get("op_kwds", {}) or {}))
+
+            t_init = time()
+
+            # Just-in-time to remove forbidden keywords.
+            _remove_forbidden_op_kwds(op_method, op_kwds)
+
+            if _coordinate_descent_pixel is not None:
+                op_params, n_iter = _coordinate_descent_normal_equations(
+                    op_kwds["x0"], *normal_equations,
+                    xtol=op_kwds["xtol"], maxiter=op_kwds["maxiter"])
+
+            else:
+                op_params, n_iter = _coordinate_descent_fixed_scatter(
+                    op_kwds["x0"], *op_kwds["args"],
+                    xtol=op_kwds["xtol"], maxiter=op_kwds["maxiter"])
+
+            fopt = _pixel_objective_function_normal_equations(
+                op_params, *normal_equations, gradient=False)
+            metadata = dict(fopt=fopt, n_iter=n_iter,
+                warnflag=int(n_iter >= op_kwds["maxiter"]))
+            break
+
+        elif op_method == "fista":
+            op_kwds = dict(x0=base_op_kwds["x0"], args=base_op_kwds["args"])
+            op_kwds.update(xtol=1e-10, maxiter=10000) # MAGIC
+            op_kwds.update((kwargs.get("op_kwds", {}) or {}))
+
+            t_init = time()
+
+            # Just-in-time to remove forbidden keywords.
+            _remove_forbidden_op_kwds(op_method, op_kwds)
+
+            op_params, n_iter = _fista_fixed_scatter(op_kwds["x0"],
+                *normal_equations, xtol=op_kwds["xtol"],
+                maxiter=op_kwds["maxiter"])
+
+            fopt = _pixel_objective_function_normal_equations(
+                op_params, *normal_equations, gradient=False)
+            metadata = dict(fopt=fopt, n_iter=n_iter,
+                warnflag=int(n_iter >= op_kwds["maxiter"]))
             break
 
         else:
-            raise ValueError("unknown optimization method '{}' -- "
-                             "powell or l_bfgs_b are available".format(op_method))
+            raise ValueError("unknown optimization method '{}' -- powell, "
+                             "l_bfgs_b, coordinate_descent or fista are "
+                             "available".format(op_method))
 
     # Additional metadata common to both optimizers.
     metadata.update(dict(op_method=op_method, op_time=time() - t_init,
         initial_theta=initial_theta, initial_theta_source=initial_theta_source))
 
     # De-censor the optimized parameters.
-    if any(censored_theta):
+    if censored_theta.any():
         theta = np.zeros(censored_theta.size)
         theta[~censored_theta] = op_params
 
@@ -521,13 +1596,5 @@ def fit_pixel_fixed_scatter(flux, ivar, initial_thetas, design_matrix,
     if theta_0 is not None:
         theta[0] = theta_0
 
-    # Fit the scatter.
-    op_fmin_kwds = dict(disp=False, maxiter=np.inf, maxfun=np.inf)
-    op_fmin_kwds.update(
-        xtol=op_kwds.get("xtol", 1e-8), ftol=op_kwds.get("ftol", 1e-8))
-
     residuals_squared = (flux - np.dot(theta, design_matrix.T))**2
-    scatter = op.fmin(_scatter_objective_function, 0.0,
-        args=(residuals_squared, ivar), disp=False)
-
-    return (theta, scatter**2, metadata)
+    return (theta, _fit_scatter(residuals_squared, ivar), metadata)
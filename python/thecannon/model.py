@@ -18,8 +18,14 @@ import pickle
 from datetime import datetime
 from functools import wraps
 from sys import version_info
+from time import time
 from scipy.spatial import Delaunay
 
+try:
+    from numpy.lib.recfunctions import structured_to_unstructured
+except ImportError: # numpy < 1.16
+    structured_to_unstructured = None
+
 from .vectorizer.base import BaseVectorizer
 from . import (censoring, fitting, utils, vectorizer as vectorizer_module, __version__)
 
@@ -42,6 +48,39 @@ def requires_training(method):
     return wrapper
 
 
+# The design matrix and pixel-major training spectra shared by all pixels, which
+# are set once in each worker process so they are not pickled with every pixel.
+_shared_training_set = None
+
+def _share_training_set(design_matrix, pixel_flux, pixel_ivar):
+    """
+    Set the training set shared by all pixels in a worker process.
+
+    :param design_matrix:
+        The model design matrix.
+
+    :param pixel_flux:
+        The training set fluxes, with shape `(num_pixels, num_stars)`.
+
+    :param pixel_ivar:
+        The training set inverse variances, with the same shape as `pixel_flux`.
+    """
+    global _shared_training_set
+    _shared_training_set = (design_matrix, pixel_flux, pixel_ivar)
+
+
+def _fit_shared_pixel(pixel, initial_thetas, design_matrix, *args, **kwargs):
+    """
+    Call `fitting.fit_pixel_fixed_scatter` for a pixel of the shared training
+    set, using the shared design matrix if `design_matrix` is `None`.
+    """
+    shared_design_matrix, pixel_flux, pixel_ivar = _shared_training_set
+    if design_matrix is None:
+        design_matrix = shared_design_matrix
+    return fitting.fit_pixel_fixed_scatter(pixel_flux[pixel], pixel_ivar[pixel],
+        initial_thetas, design_matrix, *args, **kwargs)
+
+
 class CannonModel(object):
     """
     A model for The Cannon which includes L1 regularization and pixel censoring.
@@ -110,14 +149,23 @@ class CannonModel(object):
             self._training_set_flux = np.atleast_2d(training_set_flux)
             self._training_set_ivar = np.atleast_2d(training_set_ivar)
             
-            if isinstance(training_set_labels, np.ndarray) \
+            if structured_to_unstructured is not None \
+            and isinstance(training_set_labels, np.ndarray) \
+            and training_set_labels.dtype.names is not None:
+                # A structured array: take all label columns in one pass.
+                self._training_set_labels = structured_to_unstructured(
+                    training_set_labels[list(vectorizer.label_names)],
+                    dtype=float, copy=True)
+            elif isinstance(training_set_labels, np.ndarray) \
+            and training_set_labels.ndim == 2 \
             and training_set_labels.shape[0] == self._training_set_flux.shape[0] \
             and training_set_labels.shape[1] == len(vectorizer.label_names):
                 # A valid array was given as the training set labels, not a table.
                 self._training_set_labels = training_set_labels
             else: 
-                self._training_set_labels = np.array(
-                    [training_set_labels[ln] for ln in vectorizer.label_names]).T
+                self._training_set_labels = np.stack(
+                    [training_set_labels[ln] for ln in vectorizer.label_names],
+                    axis=1)
             
             # Check that the flux and ivar are valid.
             self._verify_training_data(**kwargs)
@@ -195,7 +243,30 @@ class CannonModel(object):
         return self._design_matrix
 
 
-    def _censored_design_matrix(self, pixel_index, fill_value=np.nan):
+    def _pixel_design_matrix(self, pixel_index, shared=False, cache=None):
+        """
+        Return the design matrix to send when training the given pixel.
+
+        :param pixel_index:
+            The zero-indexed pixel.
+
+        :param shared: [optional]
+            Return `None` instead of the (uncensored) design matrix, because it
+            is already shared with the process that will fit this pixel.
+
+        :param cache: [optional]
+            A dictionary to re-use censored design matrices from, as given to
+            `_censored_design_matrix`.
+        """
+
+        design_matrix = self._censored_design_matrix(pixel_index, cache=cache)
+        if shared and design_matrix is self.design_matrix:
+            return None
+        return design_matrix
+
+
+    def _censored_design_matrix(self, pixel_index, fill_value=np.nan,
+        cache=None):
         """
         Return a censored design matrix for the given pixel index, and a mask of
         which theta values to ignore when fitting.
@@ -203,6 +274,11 @@ class CannonModel(object):
         :param pixel_index:
             The zero-indexed pixel.
 
+        :param cache: [optional]
+            A dictionary, owned by the caller, that holds the last censored
+            design matrix. Neighbouring pixels often share the same censoring,
+            so this is re-used for them instead of being re-calculated.
+
         :returns:
             A two-length tuple containing the censored design mask for this
             pixel, and a boolean mask of values to exclude when fitting for
@@ -213,18 +289,25 @@ class CannonModel(object):
         or len(set(self.censors).intersection(self.vectorizer.label_names)) == 0:
             return self.design_matrix
 
-        data = (self.training_set_labels.copy() - self._fiducials)/self._scales
-        for i, label_name in enumerate(self.vectorizer.label_names):
-            try:
-                use = self.censors[label_name][pixel_index]
+        censored = tuple(not self.censors[label_name][pixel_index] \
+            if label_name in self.censors else False \
+                for label_name in self.vectorizer.label_names)
 
-            except KeyError:
-                continue
+        if not any(censored):
+            return self.design_matrix
 
-            if not use:
-                data[:, i] = fill_value
+        key = (censored, fill_value)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        data = (self.training_set_labels.copy() - self._fiducials)/self._scales
+        data[:, np.array(censored)] = fill_value
 
-        return self.vectorizer(data).T
+        design_matrix = self.vectorizer(data).T
+        if cache is not None:
+            cache.clear()
+            cache[key] = design_matrix
+        return design_matrix
 
 
     @property
@@ -331,19 +414,16 @@ class CannonModel(object):
             self._regularization = None
             return None
 
-        regularization = np.array(regularization).flatten()
+        regularization = np.asarray(regularization, dtype=float).ravel()
+        if (regularization < 0).any() or not np.isfinite(regularization).all():
+            raise ValueError("regularization must be positive and finite")
+
         if regularization.size == 1:
             regularization = regularization[0]
-            if 0 > regularization or not np.isfinite(regularization):
-                raise ValueError("regularization must be positive and finite")
 
         elif regularization.size != self.training_set_flux.shape[1]:
             raise ValueError("regularization array must be of size `num_pixels`")
 
-            if any(0 > regularization) \
-            or not np.all(np.isfinite(regularization)):
-                raise ValueError("regularization must be positive and finite")
-
         self._regularization = regularization
         return None
 
@@ -589,7 +669,7 @@ class CannonModel(object):
 
 
     def train(self, threads=None, op_method=None, op_strict=True, op_kwds=None,
-        **kwargs):
+        warm_start_theta=None, batch=False, **kwargs):
         """
         Train the model.
 
@@ -597,15 +677,31 @@ class CannonModel(object):
             The number of parallel threads to use.
 
         :param op_method: [optional]
-            The optimization algorithm to use: l_bfgs_b (default) and powell
-            are available.
+            The optimization algorithm to fit each pixel with: l_bfgs_b, powell,
+            coordinate_descent, and fista are available. Powell's method does
+            not use the analytic gradient of the objective function and is much
+            slower. If no method is given and the regularization is the same in
+            every pixel (or there is none), all pixels are fit together as if
+            `batch` were given; otherwise each pixel is fit with l_bfgs_b.
 
         :param op_strict: [optional]
-            Default to Powell's optimization method if BFGS fails.
+            Default to coordinate descent if BFGS or Powell's method fails.
 
         :param op_kwds:
             Keyword arguments to provide directly to the optimization function.
 
+        :param warm_start_theta: [optional]
+            Spectral coefficients of shape `(num_pixels, num_terms)` to also try
+            as a starting point for each pixel. For example, the `theta` of a
+            model trained with a similar regularization strength.
+
+        :param batch: [optional]
+            Fit all pixels together by coordinate descent with
+            `fitting.fit_pixels_by_coordinate_descent`, instead of fitting each
+            pixel separately. The `threads`, `op_method` and `op_strict`
+            arguments (and any other keyword arguments) are ignored, with a
+            warning, and only `xtol` and `maxiter` are used from `op_kwds`.
+
         :returns:
             A three-length tuple containing the spectral coefficients `theta`,
             the squared scatter term at each pixel `s2`, and metadata related to
@@ -622,36 +718,96 @@ class CannonModel(object):
         S, P = self.training_set_flux.shape
         T = self.design_matrix.shape[1]
 
+        if warm_start_theta is not None \
+        and np.shape(warm_start_theta) != (P, T):
+            raise ValueError("warm_start_theta must have shape (num_pixels, "
+                             "num_terms) = ({}, {})".format(P, T))
+
         logger.info("Training {0}-label {1} with {2} stars and {3} pixels/star"\
             .format(len(self.vectorizer.label_names), type(self).__name__, S, P))
 
+        # Estimate theta for all pixels at once by linear algebra.
+        linalg_theta = fitting.fit_theta_by_linalg_batch(self.training_set_flux,
+            self.training_set_ivar, 0.0, self.design_matrix)
+
+        # Without regularization the linear algebra estimate is already the
+        # optimum (except in censored pixels), so there is little left to do
+        # and no need to run an optimizer for every pixel. The same is true
+        # when every pixel has the same regularization strength: all pixels
+        # can be fit together from their weighted Gram matrices.
+        uniform_regularization = self.regularization is None \
+            or np.all(self.regularization == np.ravel(self.regularization)[0])
+        if batch or (op_method is None and uniform_regularization):
+            ignored = [name for name, given in (
+                    ("threads", threads not in (1, None)),
+                    ("op_method", op_method is not None),
+                    ("op_strict", op_strict is not True)) if given] \
+                + sorted(set(op_kwds or {}).difference(("xtol", "maxiter"))) \
+                + sorted(kwargs)
+            if ignored:
+                logger.warn("Fitting all pixels together by coordinate descent;"
+                            " ignoring {}".format(", ".join(ignored)))
+
+            return self._train_by_coordinate_descent(
+                linalg_theta, warm_start_theta, op_kwds)
+
+        # Each pixel is fit across all stars, so store the spectra pixel-major
+        # to make the fluxes and inverse variances of every pixel contiguous.
+        pixel_flux = np.ascontiguousarray(self.training_set_flux.T)
+        pixel_ivar = np.ascontiguousarray(self.training_set_ivar.T)
+
         # Parallelise out.
+        share_training_set = False
         if threads in (1, None):
             mapper, pool = (map, None)
 
         else:
-            pool = mp.Pool(threads)
-            mapper = pool.map
-
-        func = utils.wrapper(fitting.fit_pixel_fixed_scatter, None, kwds, P)
-
-        meta = []
-        theta = np.nan * np.ones((P, T))
-        s2 = np.nan * np.ones(P)
-
-        for pixel, (flux, ivar) \
-        in enumerate(zip(self.training_set_flux.T, self.training_set_ivar.T)):
-
-            args = (
-                flux, ivar, 
-                self._initial_theta(pixel),
-                self._censored_design_matrix(pixel),
+            # Send the training set to each process once, and only the pixel
+            # index with each task.
+            share_training_set = True
+            pool = mp.Pool(threads, initializer=_share_training_set,
+                initargs=(self.design_matrix, pixel_flux, pixel_ivar))
+
+            # Stream the results back rather than collecting them in a list,
+            # and send the pixels in chunks so each task is not sent alone.
+            chunksize = max(1, int(P / (4 * threads))) # MAGIC
+            mapper = lambda f, args: pool.imap(f, args, chunksize=chunksize)
+
+        # As in fitting.fit_pixel_fixed_scatter, pixels without information are
+        # not fit, so screen them out before preparing any arguments for them.
+        informative = np.flatnonzero(
+            np.sum(self.training_set_ivar, axis=0) >= 1.0 * S) # MAGIC
+
+        func = utils.wrapper(_fit_shared_pixel \
+            if share_training_set else fitting.fit_pixel_fixed_scatter,
+            None, kwds, informative.size)
+
+        meta = [dict(message="No pixel information.", op_time=0.0) \
+            for pixel in range(P)]
+        theta = np.zeros((P, T))
+        theta[:, 0] = 1.0
+        s2 = np.inf * np.ones(P) # MAGIC
+
+        # Censored design matrices are re-used between neighbouring pixels,
+        # but only for the duration of this training.
+        censored_design_matrices = dict()
+        args = ((
+                (pixel, ) if share_training_set \
+                          else (pixel_flux[pixel], pixel_ivar[pixel])
+            ) + (
+                self._initial_theta(pixel, linalg_theta=linalg_theta[pixel],
+                    warm_start_theta=None if warm_start_theta is None \
+                                          else warm_start_theta[pixel]),
+                self._pixel_design_matrix(pixel, share_training_set,
+                    censored_design_matrices),
                 self._pixel_access(self.regularization, pixel, 0.0),
                 None
-            )
-            (pixel_theta, pixel_s2, pixel_meta), = mapper(func, [args])
+            ) for pixel in informative)
+
+        for pixel, (pixel_theta, pixel_s2, pixel_meta) \
+        in zip(informative, mapper(func, args)):
 
-            meta.append(pixel_meta)
+            meta[pixel] = pixel_meta
             theta[pixel], s2[pixel] = (pixel_theta, pixel_s2)
 
         self._theta, self._s2 = (theta, s2)
@@ -663,24 +819,130 @@ class CannonModel(object):
         return (theta, s2, meta)
 
 
+    def _train_by_coordinate_descent(self, linalg_theta, warm_start_theta=None,
+        op_kwds=None):
+        """
+        Train the model by fitting all pixels together with coordinate descent.
+
+        :param linalg_theta:
+            An estimate of `theta` for all pixels by linear algebra, which is
+            used as the starting point unless a better one is available.
+
+        :param warm_start_theta: [optional]
+            Spectral coefficients of shape `(num_pixels, num_terms)` to start
+            from, in preference to any previously trained `theta`.
+
+        :param op_kwds: [optional]
+            Keyword arguments (`xtol`, `maxiter`) for the coordinate descent.
+
+        :returns:
+            A three-length tuple containing the spectral coefficients `theta`,
+            the squared scatter term at each pixel `s2`, and metadata related to
+            the training of each pixel.
+        """
+
+        flux, ivar = (self.training_set_flux, self.training_set_ivar)
+        S, P = flux.shape
+        T = self.design_matrix.shape[1]
+
+        # Start from the most informed guess available for each pixel.
+        initial_theta = np.array(linalg_theta)
+        initial_theta_source = np.repeat("linear_algebra", P).astype(object)
+        for guess, source in ((self.theta, "previously_trained"),
+                              (warm_start_theta, "warm_start")):
+            if guess is not None:
+                finite = np.all(np.isfinite(guess), axis=1)
+                initial_theta[finite] = guess[finite]
+                initial_theta_source[finite] = source
+
+        # Which theta coefficients are censored in each pixel.
+        censored_theta = np.zeros((P, T), dtype=bool)
+        censored_design_matrices = dict()
+        for pixel in range(P):
+            design_matrix = self._censored_design_matrix(pixel,
+                cache=censored_design_matrices)
+            if design_matrix is not self.design_matrix:
+                censored_theta[pixel] \
+                    = ~np.any(np.isfinite(design_matrix), axis=0)
+
+        # As in fitting.fit_pixel_fixed_scatter, skip pixels without
+        # information.
+        informative = np.sum(ivar, axis=0) >= 1.0 * S # MAGIC
+
+        regularization = self.regularization
+        if regularization is None:
+            regularization = 0.0
+        regularization = regularization * np.ones(P)
+
+        kwds = dict(xtol=1e-10, maxiter=10000) # MAGIC
+        kwds.update((op_kwds or {}))
+
+        t_init = time()
+        theta = np.zeros((P, T))
+        theta[:, 0] = 1.0
+        n_iter = np.zeros(P, dtype=int)
+        theta[informative], n_iter[informative] \
+            = fitting.fit_pixels_by_coordinate_descent(
+                flux[:, informative], ivar[:, informative],
+                initial_theta[informative], self.design_matrix,
+                regularization[informative],
+                censored_theta=censored_theta[informative],
+                xtol=kwds["xtol"], maxiter=kwds["maxiter"])
+        logger.info("Fit {0} pixels together by coordinate descent in {1:.1f}s"\
+            .format(np.sum(informative), time() - t_init))
+
+        # Fit the scatter in each pixel, from pixel-major copies of the data so
+        # that each pixel is contiguous.
+        s2 = np.inf * np.ones(P) # MAGIC
+        meta = []
+        pixel_residuals = np.dot(theta, self.design_matrix.T)
+        np.subtract(flux.T, pixel_residuals, out=pixel_residuals)
+        pixel_ivar = np.ascontiguousarray(ivar.T)
+
+        # The final value of the objective function in each pixel.
+        fopt = np.sum(pixel_ivar * pixel_residuals**2, axis=1) \
+             + regularization * np.sum(np.abs(theta[:, 1:]), axis=1)
+
+        for pixel in range(P):
+            if not informative[pixel]:
+                meta.append(dict(message="No pixel information.", op_time=0.0))
+                continue
+
+            s2[pixel] = fitting._fit_scatter(
+                pixel_residuals[pixel]**2, pixel_ivar[pixel])
+            meta.append(dict(op_method="coordinate_descent", fopt=fopt[pixel],
+                n_iter=n_iter[pixel],
+                warnflag=int(n_iter[pixel] >= kwds["maxiter"]),
+                initial_theta=initial_theta[pixel],
+                initial_theta_source=initial_theta_source[pixel]))
+
+        self._theta, self._s2 = (theta, s2)
+        return (theta, s2, meta)
+
+
     @requires_training
-    def __call__(self, labels):
+    def __call__(self, labels, out=None):
         """
         Return spectral fluxes, given the labels.
 
         :param labels:
             An array of stellar labels.
+
+        :param out: [optional]
+            An array of shape `(num_stars, num_pixels)` to write the fluxes
+            into. This can be re-used between calls to avoid allocating a new
+            array each time.
         """
 
         # Scale and offset the labels.
         scaled_labels = (np.atleast_2d(labels) - self._fiducials)/self._scales
-        flux = np.dot(self.theta, self.vectorizer(scaled_labels)).T
+        flux = np.dot(self.vectorizer(scaled_labels).T, self.theta.T, out=out)
         return flux[0] if flux.shape[0] == 1 else flux
 
 
     @requires_training
     def test(self, flux, ivar, initial_labels=None, threads=None, 
-        use_derivatives=True, op_kwds=None):
+        use_derivatives=True, op_kwds=None, batch=False):
         """
         Run the test step on spectra.
 
@@ -704,6 +966,12 @@ class CannonModel(object):
 
         :param op_kwds: [optional]
             Optimization keywords that get passed to `scipy.optimize.leastsq`.
+
+        :param batch: [optional]
+            Fit all spectra together with `fitting.fit_spectra_by_gauss_newton`
+            instead of fitting each spectrum with `scipy.optimize.leastsq`. Only
+            the first set of initial labels for each star is used, and the
+            `threads`, `use_derivatives` and `op_kwds` arguments are ignored.
         """
 
         if flux is None or ivar is None:
@@ -712,13 +980,6 @@ class CannonModel(object):
         if op_kwds is None:
             op_kwds = dict()
 
-        if threads in (1, None):
-            mapper, pool = (map, None)
-
-        else:
-            pool = mp.Pool(threads)
-            mapper = pool.map
-
         flux, ivar = (np.atleast_2d(flux), np.atleast_2d(ivar))
         S, P = flux.shape
 
@@ -726,12 +987,29 @@ class CannonModel(object):
             raise ValueError("flux and ivar arrays must be the same shape")
 
         if initial_labels is None:
-            initial_labels = self._fiducials
+            initial_labels = self._initial_labels(flux, ivar)
 
         initial_labels = np.atleast_2d(initial_labels)
         if initial_labels.shape[0] != S and len(initial_labels.shape) == 2:
-            initial_labels = np.tile(initial_labels.flatten(), S)\
-                             .reshape(S, -1, len(self._fiducials))
+            # Every spectrum starts from the same labels, so use a view.
+            initial_labels = initial_labels.reshape(1, -1, len(self._fiducials))
+            initial_labels = np.broadcast_to(initial_labels,
+                (S, ) + initial_labels.shape[1:])
+
+        if batch:
+            if initial_labels.ndim > 2:
+                initial_labels = initial_labels[:, 0]
+            return fitting.fit_spectra_by_gauss_newton(flux, ivar,
+                initial_labels, self.vectorizer, self.theta, self.s2,
+                self._fiducials, self._scales)
+
+        if threads in (1, None):
+            mapper, pool = (map, None)
+
+        else:
+            pool = mp.Pool(threads)
+            chunksize = max(1, int(S / (4 * threads))) # MAGIC
+            mapper = lambda f, args: pool.imap(f, args, chunksize=chunksize)
 
         args = (self.vectorizer, self.theta, self.s2, self._fiducials, 
             self._scales)
@@ -749,6 +1027,48 @@ class CannonModel(object):
         return (np.array(labels), np.array(cov), meta)
 
 
+    def _initial_labels(self, flux, ivar):
+        """
+        Return an estimate of the labels for many spectra at once by linear
+        algebra. The label vector of every spectrum is solved for as if each
+        term were independent (which is the training problem with the roles of
+        stars and pixels swapped), and the labels are approximated from the
+        linear terms. Labels that cannot be estimated take the fiducial value,
+        as do all labels if the vectorizer cannot approximate them.
+
+        :param flux:
+            The (pseudo-continuum-normalized) spectral fluxes, as an array of
+            shape `(num_spectra, num_pixels)`.
+
+        :param ivar:
+            The inverse variance values for the spectral fluxes.
+
+        :returns:
+            An array of shape `(num_spectra, num_labels)` of estimated labels.
+        """
+
+        adjusted_ivar = fitting._adjusted_ivar(ivar, self.s2)
+        use = np.isfinite(flux * adjusted_ivar) * (adjusted_ivar > 0) \
+            * np.all(np.isfinite(self.theta), axis=1)
+
+        label_vectors = fitting.fit_theta_by_linalg_batch(
+            np.where(use, flux, 0).T, np.where(use, adjusted_ivar, 0).T, 0.0,
+            np.where(np.isfinite(self.theta), self.theta, 0))
+
+        try:
+            labels = self.vectorizer.get_approximate_labels(label_vectors)
+
+        except NotImplementedError:
+            labels = None
+
+        if labels is None:
+            # Not every vectorizer can approximate labels from a label vector.
+            return np.tile(self._fiducials, (flux.shape[0], 1))
+
+        labels[~np.isfinite(labels)] = 0.0
+        return labels * self._scales + self._fiducials
+
+
     def _initial_theta(self, pixel_index, **kwargs):
         """
         Return a list of guesses of the spectral coefficients for the given
@@ -756,13 +1076,22 @@ class CannonModel(object):
         order: 
 
             (1) a previously trained `theta` value for this pixel,
-            (2) an estimate of `theta` using linear algebra,
-            (3) a neighbouring pixel's `theta` value,
-            (4) the fiducial value of [1, 0, ..., 0].
+            (2) a given `theta` value to warm-start from,
+            (3) an estimate of `theta` using linear algebra,
+            (4) a neighbouring pixel's `theta` value,
+            (5) the fiducial value of [1, 0, ..., 0].
 
         :param pixel_index:
             The zero-indexed integer of the pixel.
 
+        :param linalg_theta: [optional]
+            A pre-computed estimate of `theta` by linear algebra for this pixel
+            (e.g., from `fitting.fit_theta_by_linalg_batch`).
+
+        :param warm_start_theta: [optional]
+            A `theta` value to warm-start from for this pixel (e.g., from a
+            model trained with a similar regularization strength).
+
         :returns:
             A list of initial theta guesses, and the source of each guess.
         """
@@ -774,11 +1103,19 @@ class CannonModel(object):
             if np.all(np.isfinite(self.theta[pixel_index])):
                 guesses.append((self.theta[pixel_index], "previously_trained"))
 
+        # Warm-start value.
+        theta = kwargs.get("warm_start_theta", None)
+        if theta is not None and np.all(np.isfinite(theta)):
+            guesses.append((theta, "warm_start"))
+
         # Estimate from linear algebra.
-        theta, cov = fitting.fit_theta_by_linalg(
-            self.training_set_flux[:, pixel_index],
-            self.training_set_ivar[:, pixel_index],
-            s2=kwargs.get("s2", 0.0), design_matrix=self.design_matrix)
+        theta = kwargs.get("linalg_theta", None)
+        if theta is None:
+            theta, _ = fitting.fit_theta_by_linalg(
+                self.training_set_flux[:, pixel_index],
+                self.training_set_ivar[:, pixel_index],
+                s2=kwargs.get("s2", 0.0), design_matrix=self.design_matrix,
+                full_output=False)
 
         if np.all(np.isfinite(theta)):
             guesses.append((theta, "linear_algebra"))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the fitting functions.
+"""
+
+import numpy as np
+import unittest
+from .. import fitting
+from ..vectorizer.polynomial import PolynomialVectorizer
+
+
+def _fake_pixels(S=50, P=10, T=4, seed=0):
+    rng = np.random.RandomState(seed)
+    design_matrix = np.hstack([np.ones((S, 1)), rng.normal(0, 1, (S, T - 1))])
+    theta = rng.normal(0, 0.1, (P, T))
+    flux = np.dot(design_matrix, theta.T) + rng.normal(0, 0.01, (S, P))
+    ivar = rng.uniform(1e3, 1e4, (S, P))
+    return (flux, ivar, design_matrix)
+
+
+class TestFitThetaByLinalg(unittest.TestCase):
+
+    def test_batch_matches_single_pixel(self):
+        flux, ivar, design_matrix = _fake_pixels()
+        ivar[:, 3] = 0.0
+
+        theta = fitting.fit_theta_by_linalg_batch(
+            flux, ivar, 0.01, design_matrix)
+
+        for pixel in range(flux.shape[1]):
+            expected, _ = fitting.fit_theta_by_linalg(
+                flux[:, pixel], ivar[:, pixel], 0.01, design_matrix)
+            self.assertTrue(np.allclose(theta[pixel], expected))
+
+    def test_batch_inverse_variance(self):
+        flux, ivar, design_matrix = _fake_pixels()
+        ivar[:, 3] = 0.0
+
+        theta, ATCiAinv = fitting.fit_theta_by_linalg_batch(
+            flux, ivar, 0.01, design_matrix, full_output=True)
+
+        for pixel in range(flux.shape[1]):
+            expected_theta, expected_ATCiAinv = fitting.fit_theta_by_linalg(
+                flux[:, pixel], ivar[:, pixel], 0.01, design_matrix)
+            self.assertTrue(np.allclose(theta[pixel], expected_theta))
+            self.assertTrue(np.allclose(
+                ATCiAinv[pixel], expected_ATCiAinv, equal_nan=True))
+
+
+class TestFitSpectraByGaussNewton(unittest.TestCase):
+
+    def test_matches_fit_spectrum(self):
+        vectorizer = PolynomialVectorizer(terms="a + b + a^2 + a*b + b^2")
+        rng = np.random.RandomState(0)
+        theta = rng.normal(0, 0.1, (30, 6))
+        theta[:, 0] = 1.0
+        s2 = np.zeros(30)
+        fiducials, scales = (np.array([1.0, -1.0]), np.array([2.0, 0.5]))
+
+        labels = fiducials + scales * rng.normal(0, 1, (5, 2))
+        scaled_labels = (labels - fiducials) / scales
+        flux = np.dot(vectorizer(scaled_labels).T, theta.T) \
+             + rng.normal(0, 0.01, (5, 30))
+        ivar = 1e4 * np.ones_like(flux)
+
+        op_labels, cov, meta = fitting.fit_spectra_by_gauss_newton(flux, ivar,
+            np.tile(fiducials, (5, 1)), vectorizer, theta, s2, fiducials,
+            scales)
+
+        self.assertEqual(cov.shape, (5, 2, 2))
+        for n in range(5):
+            expected, expected_cov, _ = fitting.fit_spectrum(flux[n], ivar[n],
+                fiducials, vectorizer, theta, s2, fiducials, scales)
+            self.assertTrue(np.allclose(op_labels[n], expected))
+            self.assertTrue(np.allclose(cov[n], expected_cov))
+
+
+class TestPixelObjectiveFunction(unittest.TestCase):
+
+    def test_normal_equations_match_direct_evaluation(self):
+        flux, ivar, design_matrix = _fake_pixels(P=1)
+        flux, ivar = (flux[:, 0], ivar[:, 0])
+        rng = np.random.RandomState(1)
+
+        theta_0 = rng.normal(0, 0.1, design_matrix.shape[1])
+        normal_equations = fitting._pixel_normal_equations(
+            theta_0, design_matrix, flux, ivar, 10.0)
+
+        theta = rng.normal(0, 0.1, design_matrix.shape[1])
+        f, g = fitting._pixel_objective_function_normal_equations(
+            theta, *normal_equations)
+        expected_f, expected_g = \
+            fitting._pixel_objective_function_fixed_scatter(
+                theta, design_matrix, flux, ivar, 10.0)
+
+        self.assertTrue(np.isclose(f, expected_f))
+        self.assertTrue(np.allclose(g, expected_g))
+
+
+class TestFitPixelsByCoordinateDescent(unittest.TestCase):
+
+    def test_matches_single_pixel(self):
+        flux, ivar, design_matrix = _fake_pixels()
+        P, T = (flux.shape[1], design_matrix.shape[1])
+        censored_theta = np.zeros((P, T), dtype=bool)
+        censored_theta[2, 3] = True
+
+        initial_theta = np.zeros((P, T))
+        initial_theta[:, 0] = 1.0
+        theta, n_iter = fitting.fit_pixels_by_coordinate_descent(
+            flux, ivar, initial_theta, design_matrix, 100.0,
+            censored_theta=censored_theta)
+
+        for pixel in range(P):
+            pixel_design_matrix = design_matrix.copy()
+            pixel_design_matrix[:, censored_theta[pixel]] = np.nan
+            expected, _, meta = fitting.fit_pixel_fixed_scatter(
+                flux[:, pixel], ivar[:, pixel], [(initial_theta[pixel], "")],
+                pixel_design_matrix, 100.0, None,
+                op_method="coordinate_descent")
+            self.assertTrue(np.allclose(theta[pixel], expected, atol=1e-8))
+
+        self.assertEqual(theta[2, 3], 0.0)
+
+
+class TestFitPixelFixedScatter(unittest.TestCase):
+
+    def test_fista_matches_coordinate_descent(self):
+        flux, ivar, design_matrix = _fake_pixels(P=1)
+        initial_thetas = [(np.hstack([1.0, np.zeros(3)]), "fiducial")]
+
+        theta = {}
+        for op_method in ("fista", "coordinate_descent"):
+            theta[op_method], _, meta = fitting.fit_pixel_fixed_scatter(
+                flux[:, 0], ivar[:, 0], initial_thetas, design_matrix, 100.0,
+                None, op_method=op_method)
+            self.assertEqual(meta["warnflag"], 0)
+
+        self.assertTrue(np.allclose(
+            theta["fista"], theta["coordinate_descent"], atol=1e-8))
+
+    def test_strong_regularization_fits_first_coefficient_only(self):
+        flux, ivar, design_matrix = _fake_pixels(P=1)
+        flux, ivar = (flux[:, 0], ivar[:, 0])
+        initial_thetas = [(np.hstack([1.0, np.zeros(3)]), "fiducial")]
+
+        theta, _, meta = fitting.fit_pixel_fixed_scatter(flux, ivar,
+            initial_thetas, design_matrix, 1e8, None)
+        self.assertEqual(meta["n_iter"], 0)
+        self.assertTrue(np.allclose(theta, [np.sum(ivar * flux)/np.sum(ivar),
+            0, 0, 0]))
+
+        expected, _ = fitting._coordinate_descent_fixed_scatter(
+            initial_thetas[0][0], design_matrix, flux, ivar, 1e8, 1e-10, 100)
+        self.assertTrue(np.allclose(theta, expected))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the Cannon model.
+"""
+
+import numpy as np
+import unittest
+from .. import fitting
+from ..model import CannonModel
+from ..vectorizer.base import BaseVectorizer
+from ..vectorizer.polynomial import PolynomialVectorizer
+
+
+class NoApproximateLabelsVectorizer(PolynomialVectorizer):
+
+    # Fall back to the base vectorizer, which makes no approximation.
+    get_approximate_labels = BaseVectorizer.get_approximate_labels
+
+
+def _fake_model(vectorizer, S=100, P=20, seed=0, **kwargs):
+    rng = np.random.RandomState(seed)
+    labels = rng.normal(0, 1, (S, 2))
+    theta = rng.normal(0, 0.1, (P, len(vectorizer.terms) + 1))
+    theta[:, 0] = 1.0
+    flux = np.dot(vectorizer(labels).T, theta.T) + rng.normal(0, 0.01, (S, P))
+    ivar = 1e4 * np.ones_like(flux)
+    return (CannonModel(labels, flux, ivar, vectorizer, **kwargs), labels)
+
+
+class TestCannonModel(unittest.TestCase):
+
+    def test_batch_training_warns_about_ignored_arguments(self):
+        vectorizer = PolynomialVectorizer(terms="a + b + a^2 + a*b + b^2")
+        model, labels = _fake_model(vectorizer, regularization=10.0)
+
+        with self.assertLogs("thecannon.model", "WARNING") as logs:
+            model.train(threads=2, op_kwds=dict(factr=10.0))
+        self.assertIn("ignoring threads, factr", logs.output[0])
+
+    def test_batch_training_metadata_matches_single_pixel(self):
+        vectorizer = PolynomialVectorizer(terms="a + b + a^2 + a*b + b^2")
+        model, labels = _fake_model(vectorizer, regularization=10.0)
+        theta, s2, meta = model.train()
+
+        for pixel in range(3):
+            expected, _, expected_meta = fitting.fit_pixel_fixed_scatter(
+                model.training_set_flux[:, pixel],
+                model.training_set_ivar[:, pixel],
+                [(meta[pixel]["initial_theta"], "")], model.design_matrix,
+                10.0, None, op_method="coordinate_descent")
+            self.assertEqual(meta[pixel]["initial_theta_source"],
+                "linear_algebra")
+            self.assertTrue(np.allclose(theta[pixel], expected, atol=1e-8))
+            self.assertTrue(np.isclose(meta[pixel]["fopt"],
+                expected_meta["fopt"]))
+
+    def test_initial_labels_without_approximate_labels(self):
+        vectorizer = NoApproximateLabelsVectorizer(
+            terms="a + b + a^2 + a*b + b^2")
+        model, labels = _fake_model(vectorizer)
+        model.train()
+
+        flux, ivar = (model.training_set_flux[:5], model.training_set_ivar[:5])
+        initial_labels = model._initial_labels(flux, ivar)
+        self.assertTrue(np.allclose(initial_labels, model._fiducials))
+
+        inferred_labels, cov, meta = model.test(flux, ivar)
+        self.assertTrue(np.allclose(inferred_labels, labels[:5], atol=0.1))
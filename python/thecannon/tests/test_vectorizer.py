@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the polynomial vectorizer.
+"""
+
+import numpy as np
+import pickle
+import unittest
+from ..vectorizer.polynomial import PolynomialVectorizer
+
+
+class TestPolynomialVectorizer(unittest.TestCase):
+
+    def setUp(self):
+        self.vectorizer = PolynomialVectorizer(
+            terms="a + b + c + a^2 + a*b + b^2 + c^2 + a^2*b")
+
+    def test_label_vector(self):
+        a, b, c = labels = np.array([0.3, -0.5, 2.0])
+        expected = [1, a, b, c, a**2, a*b, b**2, c**2, a**2 * b]
+        self.assertTrue(np.allclose(self.vectorizer(labels)[:, 0], expected))
+
+    def test_label_vector_derivative(self):
+        labels = np.array([0.3, 0.0, 2.0])
+        derivative = self.vectorizer.get_label_vector_derivative(labels)
+
+        h = 1e-6
+        for index in range(labels.size):
+            step = np.zeros(labels.size)
+            step[index] = h
+            expected = (self.vectorizer(labels + step)
+                      - self.vectorizer(labels - step))[:, 0] / (2 * h)
+            self.assertTrue(np.allclose(derivative[:, index], expected))
+
+    def test_pickle(self):
+        vectorizer = pickle.loads(pickle.dumps(self.vectorizer))
+        self.assertEqual(vectorizer.terms, self.vectorizer.terms)
+        self.assertEqual(vectorizer.label_names, self.vectorizer.label_names)
+
+        labels = np.array([0.3, -0.5, 2.0])
+        self.assertTrue(
+            np.allclose(vectorizer(labels), self.vectorizer(labels)))
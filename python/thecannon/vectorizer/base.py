@@ -48,7 +48,7 @@ class BaseVectorizer(object):
 
     def __setstate__(self, state):
         """ Set the state of the vectorizer. """
-        model_name, kwds = kwds
+        model_name, kwds = state
         self._label_names = kwds["label_names"]
         self._terms = kwds["terms"]
         self.metadata = kwds["metadata"]
@@ -96,4 +96,20 @@ class BaseVectorizer(object):
             The values of the labels to calculate the label vector for.
         """
         raise NotImplementedError("the get_label_vector_derivative method "
-                                  "must be specified by the sub-classes")
\ No newline at end of file
+                                  "must be specified by the sub-classes")
+
+
+    def get_approximate_labels(self, label_vector, *args, **kwargs):
+        """
+        Return approximate labels that would produce the given label vector.
+        Sub-classes can over-write this; by default no approximation is made.
+
+        :param label_vector:
+            The values of the label vector, including the leading unity term.
+
+        :returns:
+            An array of approximate labels, or `None` if they cannot be
+            approximated (in which case the model starts from the fiducial
+            labels).
+        """
+        return None
@@ -61,6 +61,25 @@ class PolynomialVectorizer(BaseVectorizer):
         return None
 
 
+    @property
+    def _powers(self):
+        """
+        Return the power of each label in each term, as an array of shape
+        `(T, K)` for `T` terms and `K` labels. This is calculated once from the
+        structured terms and cached.
+        """
+        try:
+            return self._cached_powers
+
+        except AttributeError:
+            powers = np.zeros((len(self.terms), len(self.label_names)))
+            for t, term in enumerate(self.terms):
+                for index, order in term:
+                    powers[t, index] += order
+            self._cached_powers = powers
+            return powers
+
+
     def get_label_vector(self, labels):
         """
         Return the values of the label vector, given the scaled labels.
@@ -75,13 +94,10 @@ class PolynomialVectorizer(BaseVectorizer):
         if labels.ndim > 2:
             raise ValueError("labels must be a 1-d or 2-d array")
 
-        columns = [np.ones(labels.shape[0], dtype=float)]
-        for term in self.terms:
-            column = 1. # This works; don't use np.multiply/np.product.
-            for index, order in term:
-                column *= labels[:, index]**order
-            columns.append(column)
-        return np.vstack(columns)
+        columns = np.ones((1 + len(self.terms), labels.shape[0]), dtype=float)
+        np.prod(labels[:, np.newaxis, :]**self._powers, axis=2,
+            out=columns[1:].T)
+        return columns
 
 
     def get_label_vector_derivative(self, labels):
@@ -92,37 +108,55 @@ class PolynomialVectorizer(BaseVectorizer):
             The scaled labels to calculate the label vector derivatives. This can 
             be a one-dimensional vector of `K` labels (using the same order and
             length provided by self.label_names), or a two-dimensional array of
-            `N` by `K` values. The returning array will be of shape `(N, D)`,
-            where `D` is the number of terms in the label vector description.
+            `N` by `K` values. The returning array will be of shape `(D, K)`, or
+            `(N, D, K)` for two-dimensional input, where `D` is the number of
+            terms in the label vector description (including the leading unity).
         """
 
-        L, T = (len(labels), len(self.terms))
+        labels = np.asarray(labels, dtype=float)
+        powers = self._powers
+        T, L = powers.shape
 
-        slicer = np.arange(L)
-        indices_used = np.zeros(L, dtype=bool)
+        # The derivative of each factor in each term, with respect to its own
+        # label. Labels absent from a term have a zero power, and therefore a
+        # zero derivative (the exponent is clipped so that labels of zero are
+        # never raised to a negative power).
+        labels_ = labels[..., np.newaxis, :]
+        derivatives = powers * labels_**np.maximum(powers - 1, 0)
 
-        columns = np.ones((T + 1, L), dtype=float)
-        columns[0] = 0.0 # First theta derivative always zero.
+        # Multiply by the other factors in the term, excluding the factor of
+        # the label that the derivative is taken with respect to.
+        factors = np.repeat((labels_**powers)[..., np.newaxis, :], L, axis=-2)
+        factors[..., np.arange(L), np.arange(L)] = 1.0
 
-        for t, term in enumerate(self.terms, start=1):
-                
-            indices_used[:] = False
-            
-            for index, order in term:
+        columns = np.zeros(labels.shape[:-1] + (T + 1, L), dtype=float)
+        columns[..., 1:, :] = derivatives * np.prod(factors, axis=-1)
+        return columns
 
-                dy = order * (labels[index]**(order - 1))
-                y = labels[index]**order
 
-                # If it's the index w.r.t. it, take derivative.
-                columns[t, index] *= dy
+    def get_approximate_labels(self, label_vector):
+        """
+        Return approximate (scaled) labels that would produce the given label
+        vector, using only the linear terms of the label vector.
 
-                # Otherwise, calculate as normal.
-                columns[t, slicer != index] *= y
-                indices_used[index] = True
+        :param label_vector:
+            The values of the label vector, including the leading unity term.
+            This can be a one-dimensional vector of `D + 1` values, or a two-
+            dimensional array of `N` by `D + 1` values.
 
-            columns[t, ~indices_used] = 0
+        :returns:
+            An array of shape `(N, K)` containing the approximate labels. Labels
+            that do not have a linear term in the label vector will be NaN.
+        """
 
-        return columns
+        label_vector = np.atleast_2d(label_vector)
+
+        labels = np.nan * np.ones(
+            (label_vector.shape[0], len(self.label_names)))
+        for t, term in enumerate(self.terms, start=1):
+            if len(term) == 1 and term[0][1] == 1:
+                labels[:, term[0][0]] = label_vector[:, t]
+        return labels
 
 
     def get_human_readable_label_vector(self, mul="*", pow="^", bracket=False):
@@ -40,7 +40,7 @@ training_set = (np.random.randint(0, 10, len(labelled_set)) > 0)
 
 # For the purposes of ensuring that no validation stars get in here, just ignore
 # them entirely:
-N_training_set = sum(training_set)
+N_training_set = np.count_nonzero(training_set)
 labelled_set = labelled_set[training_set]
 normalized_flux = normalized_flux[training_set]
 normalized_ivar = normalized_ivar[training_set]
@@ -37,14 +37,16 @@ PATH, CATALOG, FILE_FORMAT = ("", "apogee-rg.fits",
 
 # Load the data.
 labelled_set = Table.read(os.path.join(PATH, CATALOG))
+# These are only read, so map them read-only: copy-on-write mappings make
+# private copies of any pages touched and cannot be shared between processes.
 dispersion = np.memmap(os.path.join(PATH, FILE_FORMAT).format("dispersion"),
-    mode="c", dtype=float)
+    mode="r", dtype=float)
 normalized_flux = np.memmap(
     os.path.join(PATH, FILE_FORMAT).format("flux"),
-    mode="c", dtype=float).reshape((len(labelled_set), -1))
+    mode="r", dtype=float).reshape((len(labelled_set), -1))
 normalized_ivar = np.memmap(
     os.path.join(PATH, FILE_FORMAT).format("ivar"),
-    mode="c", dtype=float).reshape(normalized_flux.shape)
+    mode="r", dtype=float).reshape(normalized_flux.shape)
 
 elements = [label_name for label_name in labelled_set.dtype.names \
     if label_name not in ("PARAM_M_H", "SRC_H") and label_name.endswith("_H")]
@@ -57,6 +59,10 @@ q = np.random.randint(0, 10, len(labelled_set))
 validate_set = (q == 0)
 train_set = (~validate_set)
 
+# Read the validation spectra from disk once, rather than for every model.
+validate_flux = np.array(normalized_flux[validate_set])
+validate_ivar = np.array(normalized_ivar[validate_set])
+
 
 # Generate initialization points.
 label_names = ["TEFF", "LOGG"] + elements
@@ -126,7 +132,7 @@ for model_filename, validation_filename, output_filename in filenames:
     # Load any high S/N stuff from the validation set.
     if not os.path.exists(validation_filename):
         expected = model.get_labels_array(labelled_set[validate_set])
-        inferred, cov, metadata = model.fit(normalized_flux[validate_set], normalized_ivar[validate_set], full_output=True,
+        inferred, cov, metadata = model.fit(validate_flux, validate_ivar, full_output=True,
             initial_labels=initial_labels)
 
         with open(validation_filename, "wb") as fp:
@@ -145,66 +151,23 @@ for model_filename, validation_filename, output_filename in filenames:
 
     if os.path.exists(output_filename): continue
 
-    # Now fit the individual visits.
-    snrs = []
-    apogee_ids = []
-    high_snr_expected = []
-    high_snr_inferred = []
-    differences_inferred = []
-    differences_expected = []
-    single_visit_inferred = []
-    for i, apogee_id in enumerate(validation_apogee_ids):
-
-        apogee_ids.extend([apogee_id] * len(meta["SNR"]))
-
-        flux, ivar, meta = individual_visits[apogee_id]
-        N = len(meta)
-
-        iv_inferred = model.fit(flux, ivar, initial_labels=initial_labels)
-
-        # difference with respect to the high S/N case.
-        difference_inferred = iv_inferred - inferred[i]
-        difference_expected = iv_inferred - expected[i]
-
-        # Add these results
-        snrs.extend(meta["SNR"])
-        apogee_ids.extend([apogee_id] * len(meta["SNR"]))
-        high_snr_expected.extend(np.tile(expected[i], N).reshape((N, -1)))
-        high_snr_inferred.extend(np.tile(inferred[i], N).reshape((N, -1)))
-        
-        single_visit_inferred.extend(iv_inferred)
-
-        differences_inferred.extend(difference_inferred)
-        differences_expected.extend(difference_expected)
-
-        print(i, apogee_id)
-        """
-        if i % 10 == 0 and i > 0:
-            plt.close("all")
-
-            # Now plot all them things.
-            single_visit_inferred_ = np.array(single_visit_inferred)
-            snrs_, high_snr_expected_, high_snr_inferred_, differences_inferred_, differences_expected_ \
-                = map(np.array, (snrs, high_snr_expected, high_snr_inferred, differences_inferred, differences_expected))
-
-            fig, ax = plt.subplots(1, 2)
-            ok = single_visit_inferred_[:,1] < 3
-            ax[0].scatter(snrs_[~ok], np.abs(differences_expected_[:, 0])[~ok], facecolor="r")
-            ax[0].scatter(snrs_[ok], np.abs(differences_expected_[:, 0])[ok], facecolor="k")
-            ax[0].set_title("wrt ASPCAP")
-
-            ax[1].scatter(snrs_[~ok], np.abs(differences_inferred_[:, 0])[~ok], facecolor="r")
-            ax[1].scatter(snrs_[ok], np.abs(differences_inferred_[:, 0])[ok], facecolor="k")
-            ax[1].set_title("wrt TC")
-            
-            plt.draw()
-            plt.show()
-        """
-
-    # Now plot all them things.
-    single_visit_inferred = np.array(single_visit_inferred)
-    snrs, high_snr_expected, high_snr_inferred, differences_inferred, differences_expected \
-        = map(np.array, (snrs, high_snr_expected, high_snr_inferred, differences_inferred, differences_expected))
+    # Fit the individual visits of all stars together, rather than star by star.
+    visits = [individual_visits[apogee_id] for apogee_id in validation_apogee_ids]
+    single_visit_inferred = model.fit(
+        np.vstack([flux for flux, ivar, meta in visits]),
+        np.vstack([ivar for flux, ivar, meta in visits]),
+        initial_labels=initial_labels)
+
+    # Compare each visit with the high S/N results for the same star. Count
+    # the visits of each star by the rows it adds to the stacked flux, so that
+    # these line up with the fitted visits.
+    star_indices = np.repeat(np.arange(len(visits)),
+        [np.atleast_2d(flux).shape[0] for flux, ivar, meta in visits])
+    snrs = np.hstack([meta["SNR"] for flux, ivar, meta in visits])
+    high_snr_expected = np.asarray(expected)[star_indices]
+    high_snr_inferred = np.asarray(inferred)[star_indices]
+    differences_inferred = single_visit_inferred - high_snr_inferred
+    differences_expected = single_visit_inferred - high_snr_expected
 
     data = (snrs, high_snr_expected, high_snr_inferred, differences_expected, differences_inferred, single_visit_inferred)
     with open(output_filename, "wb") as fp:
@@ -36,17 +36,21 @@ q = np.random.randint(0, 10, len(labelled_set)) % 10
 validate_set = (q == 0)
 train_set = (~validate_set)
 
+# Index the training set once; every model in the grid shares these.
+train_labelled_set = labelled_set[train_set]
+train_normalized_flux = np.ascontiguousarray(normalized_flux[train_set])
+train_normalized_ivar = np.ascontiguousarray(normalized_ivar[train_set])
 
 # Save the validate flux and ivar to disk.
 train_flux = np.memmap(os.path.join(PATH, FILE_FORMAT).format("flux-train"),
-    mode="w+", dtype=float, shape=normalized_flux[train_set].shape)
-train_flux[:] = normalized_flux[train_set]
+    mode="w+", dtype=float, shape=train_normalized_flux.shape)
+train_flux[:] = train_normalized_flux
 train_flux.flush()
 del train_flux
 
 train_ivar = np.memmap(os.path.join(PATH, FILE_FORMAT).format("ivar-train"),
-    mode="w+", dtype=float, shape=normalized_ivar[train_set].shape)
-train_ivar[:] = normalized_ivar[train_set]
+    mode="w+", dtype=float, shape=train_normalized_ivar.shape)
+train_ivar[:] = train_normalized_ivar
 train_ivar.flush()
 del train_ivar
 
@@ -54,19 +58,23 @@ del train_ivar
 
 ###
 scale_factors = [0.5, 1, 2, 5, 10, 20, 30, 40, 50]
-Lambdas = 10**np.array([3, 3.5, 4, 4.5, 5])
+Lambdas = np.logspace(3, 5, 5)
 
 for scale_factor in scale_factors:
+
+    # The vectorizer only depends on the scale factor, not Lambda.
+    vectorizer = tc.vectorizer.NormalizedPolynomialVectorizer(
+        labelled_set,
+        tc.vectorizer.polynomial.terminator(["TEFF", "LOGG", "FE_H"], 2),
+        scale_factor=scale_factor)
+
     for Lambda in Lambdas:
 
-        model = tc.L1RegularizedCannonModel(labelled_set[train_set],
-            normalized_flux[train_set], normalized_ivar[train_set],
+        model = tc.L1RegularizedCannonModel(train_labelled_set,
+            train_normalized_flux, train_normalized_ivar,
             dispersion=dispersion)
 
-        model.vectorizer = tc.vectorizer.NormalizedPolynomialVectorizer(
-            labelled_set,
-            tc.vectorizer.polynomial.terminator(["TEFF", "LOGG", "FE_H"], 2),
-            scale_factor=scale_factor)
+        model.vectorizer = vectorizer
 
         model.s2 = 0.0
         model.regularization = Lambda
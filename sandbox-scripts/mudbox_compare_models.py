@@ -28,9 +28,10 @@ normalized_ivar = np.memmap(
 
 # Split up the set.
 np.random.seed(123)
-q = np.random.randint(0, 10, len(labelled_set)) % 10
-validate_set = (q == 0)
-train_set = (q > 0)
+q = np.random.randint(0, 10, len(labelled_set))
+# Index arrays are cheaper than boolean masks to use repeatedly.
+validate_set = np.flatnonzero(q == 0)
+train_set = np.flatnonzero(q > 0)
 
 
 """
@@ -100,35 +101,28 @@ for model_name, saved_filename in models_to_compare.items():
     #high_snr_comparison = model.fit(
     #    normalized_flux[validate_set], normalized_ivar[validate_set])
 
-    # Fit the individual visit spectra.
+    # Fit the individual visit spectra of all stars at once.
+    validate_apogee_ids = labelled_set["APOGEE_ID"][validate_set]
+    visits = [individual_visit_spectra[apogee_id] \
+        for apogee_id in validate_apogee_ids]
+    inferred_labels = model.fit(
+        np.vstack([flux for flux, ivar, metadata in visits]),
+        np.vstack([ivar for flux, ivar, metadata in visits]))
+
+    # The star (in the labelled set) that each visit belongs to.
+    N_visits = [len(metadata["SNR"]) for flux, ivar, metadata in visits]
+    star_indices = np.repeat(validate_set, N_visits)
+    apogee_ids = np.repeat(validate_apogee_ids, N_visits)
+
+    # Use the labelled set as the reference scale.
     individual_visit_results = {
-        "SNR": []
+        "SNR": np.hstack([metadata["SNR"] for flux, ivar, metadata in visits])
     }
-    individual_visit_results.update(
-        {label: [] for label in model.vectorizer.label_names})
-    individual_visit_actual_results = {label: [] for label in model.vectorizer.label_names}
-
-    apogee_ids = []
-    N_validate_set_stars = sum(validate_set)
-    for i, apogee_id in enumerate(labelled_set["APOGEE_ID"][validate_set]):
-
-        inv_visit_flux, inv_visit_ivar, metadata = individual_visit_spectra[apogee_id]
-
-        # Infer the labels from the individual visits.
-        inferred_labels = model.fit(inv_visit_flux, inv_visit_ivar)
-
-        # Use the labelled set as the reference scale.
-        match = labelled_set["APOGEE_ID"] == apogee_id
-        for j, label_name in enumerate(model.vectorizer.label_names):
-
-            individual_visit_results[label_name].extend(
-                inferred_labels[:, j] - labelled_set[label_name][match][0])
-            individual_visit_actual_results[label_name].extend(
-                inferred_labels[:, j]
-                )
-        individual_visit_results["SNR"].extend(metadata["SNR"])
-        apogee_ids.extend([apogee_id] * len(metadata["SNR"]))
-        print(i, apogee_id)
+    individual_visit_actual_results = {}
+    for j, label_name in enumerate(model.vectorizer.label_names):
+        individual_visit_results[label_name] = inferred_labels[:, j] \
+            - labelled_set[label_name][star_indices]
+        individual_visit_actual_results[label_name] = inferred_labels[:, j]
 
 
     # Now plot the differences.
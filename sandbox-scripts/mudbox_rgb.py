@@ -9,6 +9,7 @@ import cPickle as pickle
 import numpy as np
 import os
 from astropy.table import Table
+from numpy.lib.recfunctions import structured_to_unstructured
 
 import AnniesLasso as tc
 
@@ -39,10 +40,11 @@ elements = [label_name for label_name in labelled_set.dtype.names \
     if label_name not in ("PARAM_M_H", "SRC_H") and label_name.endswith("_H")]
 
 # Split up the data into ten random subsets.
-q = np.random.randint(0, 10, len(labelled_set)) % 10
+q = np.random.randint(0, 10, len(labelled_set))
 
-validate_set = (q == 0)
-train_set = (~validate_set)
+# Index arrays are cheaper than boolean masks to use repeatedly.
+validate_set = np.flatnonzero(q == 0)
+train_set = np.flatnonzero(q > 0)
 
 # Create a vectorizer for all models.
 vectorizer = tc.vectorizer.NormalizedPolynomialVectorizer(labelled_set,
@@ -69,8 +71,8 @@ with open(filename, "wb") as fp:
 # Fit the remaining set of normalized spectra (just as a check: we will need to
 # do this for the individual stuff too.)
 inferred_labels = model.fit(normalized_flux[validate_set], normalized_ivar[validate_set])
-expected_labels = np.vstack([labelled_set[label_name][validate_set] \
-    for label_name in model.vectorizer.label_names]).T
+expected_labels = structured_to_unstructured(labelled_set.as_array()[
+    list(model.vectorizer.label_names)][validate_set], dtype=float)
 
 for i, label_name in enumerate(model.vectorizer.label_names):
     
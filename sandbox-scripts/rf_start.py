@@ -26,10 +26,11 @@ normalized_ivar = np.memmap(
 
 # Split up the data into ten random subsets.
 np.random.seed(123) # For reproducibility.
-q = np.random.randint(0, 10, len(labelled_set)) % 10
+q = np.random.randint(0, 10, len(labelled_set))
 
-validate_set = (q == 0)
-train_set = (~validate_set)
+# Index arrays are cheaper than boolean masks to use repeatedly.
+validate_set = np.flatnonzero(q == 0)
+train_set = np.flatnonzero(q > 0)
 
 
 a._dispersion = dispersion
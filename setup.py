@@ -44,7 +44,8 @@ setup(
     packages=find_packages(exclude=["documents", "tests"]),
     install_requires=["numpy", "scipy", "six"],
     extras_require={
-        "test": ["coverage"]
+        "test": ["coverage"],
+        "jit": ["numba"]
     },
     package_data={
         "": ["LICENSE"],